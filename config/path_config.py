@@ -9,6 +9,8 @@ DATA = "data"
 AUTH = "config/auth"
 
 AUTH_TWITTER = BASE_DIR / "config" / "auth" / "twitter_auth.json"
+SCRAPE_STATE = BASE_DIR / DATA / "from_prefect" / "scrape_state.sqlite"
+CLASSIFY_CACHE = BASE_DIR / DATA / "from_prefect" / "classify_cache.sqlite"
 
 repo_name = "tweets-repo"
 repo_name_ml = "tweets-repo-wordcloud"
@@ -19,10 +21,25 @@ branch_name = "main"
 path = "tweets.parquet"
 path_ml = "tweets_wordcloud.parquet"
 path_hash = "latest_hash.md5"
+path_rollup = "tweets_rollup.parquet"
+path_subtopics = "subtopic_counts.parquet"
+path_subtopic_index = "subtopic_index.parquet"
 
 lakefs_s3_path = f"s3://{repo_name}/{branch_name}/{path}"
 lakefs_s3_path_ml = f"s3://{repo_name_ml}/{branch_name}/{path_ml}"
 lakefs_s3_path_hash = f"s3://{repo_name_hash}/{branch_name}/{path_hash}"
+# 15-minute tweet counts per tag/category, kept next to the raw tweets
+lakefs_s3_path_rollup = f"s3://{repo_name}/{branch_name}/{path_rollup}"
+# Subtopic frequencies per 15-minute bucket and tag, kept next to the word cloud data
+lakefs_s3_path_subtopics = f"s3://{repo_name_ml}/{branch_name}/{path_subtopics}"
+# Subtopic -> tweet_id lookup for word cloud drill-down
+lakefs_s3_path_subtopic_index = f"s3://{repo_name_ml}/{branch_name}/{path_subtopic_index}"
+ROLLUP_FREQ = "15min"
+
+# Per-day dedup digests stored next to each dataset, e.g. tweets.parquet.dedup/year=2025/month=5/day=21
+DEDUP_INDEX_SUFFIX = ".dedup"
+# Tags and post-time bounds of a dataset, e.g. tweets.parquet.summary.json, so the dashboard form needs no scan
+DATASET_SUMMARY_SUFFIX = ".summary.json"
 
 tags = {
     "ธรรมศาสตร์": [
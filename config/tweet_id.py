@@ -0,0 +1,13 @@
+import re
+import pandas as pd
+
+# Numeric status id in a tweet link, e.g. https://x.com/<user>/status/<id>; shared by the pipeline and the dashboard
+STATUS_ID_PATTERN = r"/status/(\d+)"
+
+def tweet_id(tweet_link: str | None) -> int | None:
+    match = re.search(STATUS_ID_PATTERN, tweet_link or "")
+    return int(match.group(1)) if match else None
+
+def tweet_ids(tweet_links: pd.Series) -> pd.Series:
+    # Rows without a status id stay <NA>
+    return tweet_links.astype("string").str.extract(STATUS_ID_PATTERN, expand=False).astype("Int64")
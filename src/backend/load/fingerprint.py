@@ -0,0 +1,72 @@
+import numpy as np
+import pandas as pd
+
+# Import tweet id parsing
+from config.tweet_id import tweet_ids
+
+FINGERPRINT_COLUMNS = ["tweet_id"]
+PARTITION_COLUMNS = ["year", "month", "day"]
+# Dedup shards remember every (tweet_id, tag) pair stored in a day partition
+SHARD_COLUMNS = ["tweet_id", "tag"]
+def backfill_tweet_ids(df: pd.DataFrame) -> pd.DataFrame:
+    # Rows written before tweet_id existed still carry tweet_link
+    ids = df["tweet_id"].astype("Int64") if "tweet_id" in df.columns else pd.Series(pd.NA, index=df.index, dtype="Int64")
+    if "tweet_link" in df.columns:
+        ids = ids.fillna(tweet_ids(df["tweet_link"]))
+    return df.assign(tweet_id=ids)
+
+def duplicated_keys(df: pd.DataFrame, columns: list[str]) -> pd.Series:
+    # List cells (word cloud topic/subtopic) are compared as tuples, since lists are not hashable
+    keys = pd.DataFrame({
+        col: df[col].map(lambda value: tuple(value) if isinstance(value, (list, np.ndarray)) else value) if df[col].dtype == object else df[col]
+        for col in columns
+    })
+    return keys.duplicated()
+
+def shard_keys(df: pd.DataFrame) -> pd.DataFrame:
+    keys = df[SHARD_COLUMNS].dropna(subset=["tweet_id"]).astype({"tweet_id": "int64", "tag": str})
+    return keys.drop_duplicates().sort_values(SHARD_COLUMNS).reset_index(drop=True)
+
+def is_stored(df: pd.DataFrame, known: pd.DataFrame) -> np.ndarray:
+    keys = pd.MultiIndex.from_arrays([df["tweet_id"].astype("int64"), df["tag"].astype(str)])
+    return keys.isin(pd.MultiIndex.from_frame(known[SHARD_COLUMNS]))
+
+def row_hashes(df: pd.DataFrame, columns: list[str] = FINGERPRINT_COLUMNS) -> np.ndarray:
+    # Normalise dtypes first so the same rows hash identically whatever the in-memory schema
+    keys = pd.DataFrame({
+        col: df[col].astype("datetime64[ns]") if pd.api.types.is_datetime64_any_dtype(df[col]) else df[col].astype(str)
+        for col in columns
+    })
+    return pd.util.hash_pandas_object(keys, index=False).to_numpy(dtype=np.uint64)
+
+def combine(hashes: np.ndarray) -> str:
+    # Wrapping sum and xor of the row hashes: independent of row order
+    hashes = np.asarray(hashes, dtype=np.uint64)
+    total = int(np.add.reduce(hashes, dtype=np.uint64)) if len(hashes) else 0
+    xor = int(np.bitwise_xor.reduce(hashes)) if len(hashes) else 0
+    return f"{total:016x}{xor:016x}"
+
+def dataset_fingerprint(df: pd.DataFrame, columns: list[str] = FINGERPRINT_COLUMNS) -> str:
+    return combine(row_hashes(df, columns))
+
+def partition_key(year: int, month: int, day: int) -> str:
+    return f"{int(year):04d}-{int(month):02d}-{int(day):02d}"
+
+def partition_fingerprints(df: pd.DataFrame, columns: list[str] = FINGERPRINT_COLUMNS, partition_cols: list[str] = PARTITION_COLUMNS) -> dict[str, str]:
+    if df.empty:
+        return {}
+    hashes = row_hashes(df, columns)
+    grouped = df.groupby(partition_cols, sort=True)
+    codes = grouped.ngroup().to_numpy()
+    order = np.argsort(codes, kind="stable")
+    sorted_codes, sorted_hashes = codes[order], hashes[order]
+    starts = np.r_[0, np.flatnonzero(np.diff(sorted_codes)) + 1]
+    totals = np.add.reduceat(sorted_hashes, starts, dtype=np.uint64)
+    xors = np.bitwise_xor.reduceat(sorted_hashes, starts)
+    return {
+        partition_key(*key): f"{int(total):016x}{int(xor):016x}"
+        for key, total, xor in zip(grouped.size().index, totals, xors)
+    }
+
+def changed_partitions(previous: dict[str, str], current: dict[str, str]) -> list[str]:
+    return sorted(key for key in set(previous) | set(current) if previous.get(key) != current.get(key))
@@ -1,106 +1,222 @@
 from lakefs.client import Client
 import lakefs
 from lakefs import repositories
-import subprocess
 import pandas as pd
 from dotenv import load_dotenv
 import os
-import shutil
-import hashlib
+import json
+import threading
+import time
+import urllib.request
+import urllib.error
+import uuid
+from contextlib import contextmanager
+from datetime import datetime
 import fsspec
+import pyarrow as pa
+import pyarrow.parquet as pq
+from prefect.runtime import flow_run
 
 # Import modern log configuration
 from config.logging.modern_log import LoggingConfig
+# Import dataset fingerprinting
+from src.backend.load.fingerprint import FINGERPRINT_COLUMNS, PARTITION_COLUMNS, SHARD_COLUMNS, backfill_tweet_ids, duplicated_keys, shard_keys, is_stored, dataset_fingerprint, partition_fingerprints, changed_partitions
+# Import Parquet schema enforcement
+from src.backend.load.schema import arrow_schema, conform_table
+# Import time-bucket rollups
+from src.backend.load.rollup import ROLLUP_KEYS, ROLLUP_SOURCE_COLUMNS, SUBTOPIC_KEYS, SUBTOPIC_SOURCE_COLUMNS, rollup_counts, subtopic_counts, subtopic_index, merge_counts, dataset_summary, merge_summaries
 # Import path configuration
-from config.path_config import lakefs_s3_path, repo_name, branch_name, lakefs_s3_path_hash, repo_name_hash
+from config.path_config import lakefs_s3_path, repo_name, branch_name, lakefs_s3_path_hash, repo_name_hash, lakefs_s3_path_rollup, lakefs_s3_path_ml, lakefs_s3_path_subtopics, lakefs_s3_path_subtopic_index, DEDUP_INDEX_SUFFIX, DATASET_SUMMARY_SUFFIX
 
 logger = LoggingConfig(level="DEBUG", level_console="INFO").get_logger(__name__)
 
 load_dotenv()
 
-import time  # <-- เพิ่มสำหรับ sleep
+S3_MAX_POOL_CONNECTIONS = 32
+
+# Natural row key per dataset: a tweet is stored once per tag, and once per classification in the word cloud.
+# Stored rows are matched on (tweet_id, tag), since a tweet's classifications for a tag are always loaded together.
+ROW_KEYS = {
+    lakefs_s3_path: ["tweet_id", "tag"],
+    lakefs_s3_path_ml: ["tweet_id", "tag", "topic", "subtopic"],
+}
+
+_loaders: dict[str, "LakeFSLoader"] = {}
+_loaders_lock = threading.Lock()
+
+def get_loader(host: str = "http://localhost:8001") -> "LakeFSLoader":
+    # One loader (lakeFS client + pooled S3 filesystem) per endpoint for the whole process
+    with _loaders_lock:
+        if host not in _loaders:
+            _loaders[host] = LakeFSLoader(host=host)
+        return _loaders[host]
 
 class LakeFSLoader:
-    def __init__(self, host: str = "http://localhost:8001"):
-        self.restart_container()
+    def __init__(self, host: str = "http://localhost:8001", ready_timeout: float = 60.0):
+        self.host = host
+        self.wait_until_ready(timeout=ready_timeout)
         self.client = Client(
             host=host,
             username=os.getenv("ACCESS_KEY"),  
             password=os.getenv("SECRET_KEY"),
             verify_ssl=False,
         )
+        self._repositories = set()
+        self.last_commit_id = None
         logger.debug(f"Connected to lakeFS version: {self.client.version}")
 
-    def load_hash(self, df: pd.DataFrame, lakefs_endpoint: str, repo_name: str = repo_name_hash):
-        logger.info(f"Creating or replacing repository hash: {repo_name}")
-        lakefs.repository(repo_name, client=self.client).create(storage_namespace=f"local://{repo_name}")
-        logger.info(f"Repository {repo_name} hash created or already exists.")
+    def wait_until_ready(self, timeout: float = 60.0) -> None:
+        health_url = f"{self.host.rstrip('/')}/_health"
+        deadline = time.monotonic() + timeout
+        delay = 0.5
+        while True:
+            try:
+                with urllib.request.urlopen(health_url, timeout=5) as response:
+                    if response.status == 200:
+                        logger.debug(f"lakeFS is ready at {self.host}")
+                        return
+            except (urllib.error.URLError, OSError) as e:
+                logger.debug(f"lakeFS not ready yet at {self.host}: {e}")
+            if time.monotonic() + delay > deadline:
+                raise RuntimeError(f"lakeFS at {self.host} did not become ready within {timeout:.0f}s")
+            time.sleep(delay)
+            delay = min(delay * 2, 5.0)
 
-        storage_options = {
+    @staticmethod
+    def storage_options(lakefs_endpoint: str) -> dict:
+        # Identical options resolve to the same cached fsspec S3 filesystem and its connection pool
+        return {
             "key": os.getenv("ACCESS_KEY"),
             "secret": os.getenv("SECRET_KEY"),
             "client_kwargs": {
                 "endpoint_url": lakefs_endpoint
-            }
+            },
+            "config_kwargs": {
+                "max_pool_connections": S3_MAX_POOL_CONNECTIONS
+            },
         }
-        columns = ["postTimeRaw", "username", "tweetText"]
-        data_str = df[columns].astype(str).apply(lambda row: "_".join(row), axis=1).str.cat()
-        hash_text = hashlib.md5(data_str.encode()).hexdigest()
-        fs = fsspec.filesystem("s3", **storage_options)
-        with fs.open(lakefs_s3_path_hash, "w") as f:
-            f.write(hash_text)   
-        logger.info(f"Uploaded hash: {hash_text} to {lakefs_s3_path_hash}")
 
-    def check_hash(self, df: pd.DataFrame, lakefs_endpoint: str) -> bool:
-        storage_options = {
-            "key": os.getenv("ACCESS_KEY"),
-            "secret": os.getenv("SECRET_KEY"),
-            "client_kwargs": {
-                "endpoint_url": lakefs_endpoint
-            }
+    def filesystem(self, lakefs_endpoint: str):
+        return fsspec.filesystem("s3", **self.storage_options(lakefs_endpoint))
+
+    def ensure_repository(self, repo_name: str) -> None:
+        if repo_name in self._repositories:
+            return
+        logger.info(f"Creating repository if missing: {repo_name}")
+        lakefs.repository(repo_name, client=self.client).create(storage_namespace=f"local://{repo_name}", exist_ok=True)
+        self._repositories.add(repo_name)
+        logger.info(f"Repository {repo_name} created or already exists.")
+
+    def load_hash(self, df: pd.DataFrame, lakefs_endpoint: str, repo_name: str = repo_name_hash):
+        self.ensure_repository(repo_name)
+
+        fingerprint = self.fingerprint(df)
+        fs = self.filesystem(lakefs_endpoint)
+        with self.staging_branch(repo_name, message="Update dataset fingerprint", metadata=self.commit_metadata(df)) as branch:
+            with fs.open(self.on_branch(lakefs_s3_path_hash, branch), "w") as f:
+                json.dump(fingerprint, f)
+        logger.info(f"Uploaded fingerprint: {fingerprint['fingerprint']} ({len(fingerprint['partitions'])} partitions) to {lakefs_s3_path_hash}")
+
+    @staticmethod
+    def fingerprint(df: pd.DataFrame) -> dict:
+        return {
+            "fingerprint": dataset_fingerprint(df),
+            "partitions": partition_fingerprints(df),
+        }
+
+    @staticmethod
+    def commit_metadata(df: pd.DataFrame, columns: list[str] = FINGERPRINT_COLUMNS) -> dict:
+        return {
+            "row_count": len(df),
+            "fingerprint": dataset_fingerprint(df, columns),
+            "flow_run_id": flow_run.id or "",
         }
-        columns = ["postTimeRaw", "username", "tweetText"]
-        data_str = df[columns].astype(str).apply(lambda row: "_".join(row), axis=1).str.cat()
-        new_hash = hashlib.md5(data_str.encode()).hexdigest()
 
-        fs = fsspec.filesystem("s3", **storage_options)
+    def check_hash(self, df: pd.DataFrame, lakefs_endpoint: str) -> bool:
+        self.ensure_repository(repo_name_hash)
+        new_fingerprint = self.fingerprint(df)
+
+        fs = self.filesystem(lakefs_endpoint)
 
         if fs.exists(lakefs_s3_path_hash):
             with fs.open(lakefs_s3_path_hash, "r") as f:
-                existing_hash = f.read().strip()
-            if new_hash == existing_hash:
+                content = f.read().strip()
+            try:
+                existing_fingerprint = json.loads(content)
+            except json.JSONDecodeError:
+                # Plain MD5 written before fingerprints were introduced
+                existing_fingerprint = {"fingerprint": content, "partitions": {}}
+            if new_fingerprint["fingerprint"] == existing_fingerprint.get("fingerprint"):
                 logger.info("No changes detected. Hash matched.")
-                return False 
+                return False
+            changed = changed_partitions(existing_fingerprint.get("partitions", {}), new_fingerprint["partitions"])
+            logger.info(f"Changed partitions: {', '.join(changed) if changed else 'none'}")
 
-        with fs.open(lakefs_s3_path_hash, "w") as f:
-            f.write(new_hash)
-        logger.info(f"Uploaded new hash: {new_hash} to {lakefs_s3_path_hash}")
+        with self.staging_branch(repo_name_hash, message="Update dataset fingerprint", metadata=self.commit_metadata(df)) as branch:
+            with fs.open(self.on_branch(lakefs_s3_path_hash, branch), "w") as f:
+                json.dump(new_fingerprint, f)
+        logger.info(f"Uploaded new fingerprint: {new_fingerprint['fingerprint']} to {lakefs_s3_path_hash}")
         return True  
     
-    def restart_container(self, container_name="lakefs_db"):
+    @staticmethod
+    def on_branch(lakefs_s3_path: str, branch: str) -> str:
+        # s3://<repo>/<ref>/<key> -> s3://<repo>/<branch>/<key>
+        repo, _, key = lakefs_s3_path.removeprefix("s3://").split("/", 2)
+        return f"s3://{repo}/{branch}/{key}"
+
+    @staticmethod
+    def repository_of(lakefs_s3_path: str) -> str:
+        return lakefs_s3_path.removeprefix("s3://").split("/", 1)[0]
+
+    @contextmanager
+    def staging_branch(self, repo_name: str, message: str, metadata: dict | None = None, prefix: str = "staging"):
+        # Writes go to an ephemeral branch that is committed and merged into main in one step
+        repo = lakefs.repository(repo_name, client=self.client)
+        branch_id = f"{prefix}-{datetime.now().strftime('%Y%m%d%H%M%S')}-{uuid.uuid4().hex[:8]}"
+        staging = repo.branch(branch_id).create(source_reference=branch_name)
+        logger.debug(f"Created staging branch {repo_name}/{branch_id}")
         try:
-            stop_command = ["docker", "compose", "down", container_name]
-            logger.info(f"Stopping container: {' '.join(stop_command)}")
-            stop_result = subprocess.run(stop_command, capture_output=True, text=True)
-
-            if stop_result.returncode == 0:
-                logger.info(f"Container {container_name} stopped successfully.")
-            else:
-                logger.error(f"Failed to stop container {container_name}. Error: {stop_result.stderr.strip()}")
-
-            start_command = ["docker", "compose", "up", "-d", container_name]
-            logger.info(f"Starting container: {' '.join(start_command)}")
-            start_result = subprocess.run(start_command, capture_output=True, text=True)
-
-            if start_result.returncode == 0:
-                logger.info(f"Container {container_name} started successfully.")
-                logger.info("Waiting for container to be ready...")
-                time.sleep(10)  
-            else:
-                logger.error(f"Failed to start container {container_name}. Error: {start_result.stderr.strip()}")
+            yield branch_id
+            if next(iter(staging.uncommitted(max_amount=1)), None) is None:
+                logger.info(f"No changes staged on {repo_name}/{branch_id}, nothing to merge.")
+                return
+            staging.commit(message=message, metadata={key: str(value) for key, value in (metadata or {}).items()})
+            self.last_commit_id = staging.merge_into(repo.branch(branch_name))
+            logger.info(f"Merged {repo_name}/{branch_id} into {branch_name} ({self.last_commit_id}): {message}")
+        finally:
+            staging.delete()
 
-        except Exception as e:
-            logger.error(f"Exception occurred while restarting container {container_name}: {str(e)}")
+    def compact_partitions(self, lakefs_endpoint: str, lakefs_s3_path: str = lakefs_s3_path, min_files: int = 4, row_group_size: int = 128_000, sort_by: str = "postTimeRaw") -> dict:
+        fs = self.filesystem(lakefs_endpoint)
+        fs.invalidate_cache()
+        dataset_root = lakefs_s3_path.removeprefix("s3://")
+        partitions = {}
+        for file_path in fs.glob(f"{dataset_root}/year=*/month=*/day=*/*.parquet"):
+            partitions.setdefault(file_path.rsplit("/", 1)[0], []).append(file_path)
+        partitions = {partition: files for partition, files in partitions.items() if len(files) >= min_files}
+        if not partitions:
+            logger.info(f"No partitions with at least {min_files} files under {lakefs_s3_path}")
+            return {"partitions": 0, "files_before": 0, "files_after": 0}
+
+        files_before = sum(len(files) for files in partitions.values())
+        summary = {"partitions": len(partitions), "files_before": files_before, "files_after": len(partitions)}
+        repo = self.repository_of(lakefs_s3_path)
+        with self.staging_branch(repo, message=f"Compact {len(partitions)} partitions of {lakefs_s3_path}", metadata=summary, prefix="compact") as branch:
+            for partition, files in partitions.items():
+                staged_files = [self.on_branch(f"s3://{file_path}", branch).removeprefix("s3://") for file_path in files]
+                # Older files may predate the shared schema, so every table is cast to it first
+                tables = [conform_table(pq.read_table(file_path, filesystem=fs)) for file_path in staged_files]
+                table = pa.concat_tables(tables, promote_options="default")
+                if sort_by in table.column_names:
+                    # Sorted rows give tight row-group statistics for predicate pushdown
+                    table = table.sort_by(sort_by)
+                compacted_path = self.on_branch(f"s3://{partition}", branch).removeprefix("s3://") + f"/compacted-{uuid.uuid4().hex}.parquet"
+                pq.write_table(table, compacted_path, filesystem=fs, row_group_size=row_group_size)
+                fs.rm(staged_files)
+                logger.debug(f"Compacted {len(files)} files ({table.num_rows} rows) in {partition}")
+
+        logger.info(f"Compacted {files_before} files into {len(partitions)} under {lakefs_s3_path}")
+        return summary
 
     def connect(self):
         try:
@@ -112,26 +228,26 @@ class LakeFSLoader:
             logger.error("Error connecting to lakeFS", exc_info=True)
 
     def load(self, data: pd.DataFrame, lakefs_endpoint: str, repo_name: str = repo_name, lakefs_s3_path: str = lakefs_s3_path) -> None:
-        logger.info(f"Creating or replacing repository: {repo_name}")
-        lakefs.repository(repo_name, client=self.client).create(storage_namespace=f"local://{repo_name}")
-        logger.info(f"Repository {repo_name} created or already exists.")
+        self.ensure_repository(repo_name)
 
         logger.debug(f"Uploading data to lakeFS repository: {repo_name} on branch: {branch_name}")
 
-        storage_options = {
-            "key": os.getenv("ACCESS_KEY"),
-            "secret": os.getenv("SECRET_KEY"),
-            "client_kwargs": {
-                "endpoint_url": lakefs_endpoint
-            }
-        }
-        
-        data.to_parquet(
-            lakefs_s3_path,
-            storage_options=storage_options,
-            partition_cols=['year', 'month', 'day'],
-            engine='pyarrow',
-        )
+        storage_options = self.storage_options(lakefs_endpoint)
+        # Every row is written, but the dedup shards still learn its ids so later incremental loads skip them
+        _, shard_updates = self.find_new_rows(data, lakefs_endpoint, lakefs_s3_path)
+
+        with self.staging_branch(repo_name, message=f"Load {len(data)} rows into {lakefs_s3_path}", metadata=self.commit_metadata(data)) as branch:
+            staged_path = self.on_branch(lakefs_s3_path, branch)
+            data.to_parquet(
+                staged_path,
+                storage_options=storage_options,
+                partition_cols=['year', 'month', 'day'],
+                engine='pyarrow',
+                schema=arrow_schema(data),
+            )
+            self.write_dedup_shards(staged_path, shard_updates, storage_options)
+            self.update_dataset_summary(data, lakefs_endpoint, lakefs_s3_path, branch)
+            self.update_derived(data, lakefs_endpoint, lakefs_s3_path, branch)
 
         valid_data = pd.read_parquet(
             lakefs_s3_path,
@@ -140,52 +256,260 @@ class LakeFSLoader:
         )
         logger.info(f"Data uploaded successfully to {lakefs_s3_path} with {len(valid_data)} records.")
 
-    def incremental_load(self, data: pd.DataFrame, lakefs_endpoint: str, lakefs_s3_path: str = lakefs_s3_path, is_wordcloud: bool=False) -> None:
-        storage_options = {
-            "key": os.getenv("ACCESS_KEY"),
-            "secret": os.getenv("SECRET_KEY"),
-            "client_kwargs": {
-                "endpoint_url": lakefs_endpoint
-            }
-        }
-        data_in_lakefs = pd.read_parquet(
-            lakefs_s3_path,
+    def high_water_marks(self, lakefs_endpoint: str, rollup_s3_path: str = lakefs_s3_path_rollup, days: int = 7) -> dict:
+        # Latest rollup bucket per tag, read from the newest day partitions only rather than the whole history
+        partitions = self.day_partitions(lakefs_endpoint, rollup_s3_path)
+        if not partitions:
+            logger.warning(f"No rollup found at {rollup_s3_path}, scraping without high-water marks.")
+            return {}
+        latest = partitions[-days:]
+        rollup = pd.concat(
+            pd.read_parquet(self.partition_path(rollup_s3_path, year, month, day) + "/counts.parquet", columns=["tag", "bucket"], storage_options=self.storage_options(lakefs_endpoint), engine='pyarrow')
+            for year, month, day in latest
+        )
+        # A bucket start is never later than the tweets counted in it, so nothing newer is skipped
+        marks = rollup.groupby("tag", observed=True)["bucket"].max()
+        logger.info(f"Loaded rollup high-water marks for {len(marks)} tags from {len(latest)} day partitions")
+        return {str(tag): bucket.to_pydatetime() for tag, bucket in marks.items()}
+
+    @staticmethod
+    def partition_path(base_path: str, year: int, month: int, day: int) -> str:
+        return f"{base_path}/year={int(year)}/month={int(month)}/day={int(day)}"
+
+    def day_partitions(self, lakefs_endpoint: str, lakefs_s3_path: str) -> list[tuple[int, int, int]]:
+        # (year, month, day) of every partition directory under a dataset, oldest first
+        fs = self.filesystem(lakefs_endpoint)
+        fs.invalidate_cache()
+        directories = fs.glob(f"{lakefs_s3_path.removeprefix('s3://')}/year=*/month=*/day=*")
+        return sorted(tuple(int(part.split("=", 1)[1]) for part in directory.rsplit("/", 3)[1:]) for directory in directories)
+
+    def load_dedup_shard(self, fs, lakefs_s3_path: str, year: int, month: int, day: int, storage_options: dict) -> pd.DataFrame:
+        shard_path = self.partition_path(f"{lakefs_s3_path}{DEDUP_INDEX_SUFFIX}", year, month, day) + "/tweet_ids.parquet"
+        if fs.exists(shard_path):
+            shard = pd.read_parquet(shard_path, storage_options=storage_options, engine='pyarrow')
+            if "tag" in shard.columns:
+                return shard_keys(shard)
+            # Shards written before tags were stored hold ids only and are rebuilt like missing ones
+            logger.info(f"Dedup index shard {shard_path} has no tags, rebuilding it")
+
+        # Bootstrap the shard from the matching data partition only
+        data_partition = self.partition_path(lakefs_s3_path, year, month, day)
+        if not fs.exists(data_partition):
+            return shard_keys(pd.DataFrame(columns=SHARD_COLUMNS))
+        logger.info(f"Building dedup index shard from {data_partition}")
+        return shard_keys(backfill_tweet_ids(pd.read_parquet(data_partition, storage_options=storage_options, engine='pyarrow')))
+
+    def write_dedup_shard(self, lakefs_s3_path: str, year: int, month: int, day: int, keys: pd.DataFrame, storage_options: dict) -> None:
+        shard_path = self.partition_path(f"{lakefs_s3_path}{DEDUP_INDEX_SUFFIX}", year, month, day) + "/tweet_ids.parquet"
+        keys.to_parquet(
+            shard_path,
             storage_options=storage_options,
             engine='pyarrow',
+            index=False,
         )
-        if is_wordcloud:
-            new_unique_data = data.merge(
-                data_in_lakefs,
-                on=["postTimeRaw", "tweetText"],    
-                how="left",
-                indicator=True
-            ).query('_merge == "left_only"').drop(columns=['_merge'])
+
+    def write_dedup_shards(self, lakefs_s3_path: str, shard_updates: dict, storage_options: dict) -> None:
+        for (year, month, day), keys in shard_updates.items():
+            self.write_dedup_shard(lakefs_s3_path, year, month, day, keys, storage_options)
+
+    def update_dataset_summary(self, data: pd.DataFrame, lakefs_endpoint: str, lakefs_s3_path: str, branch: str) -> dict:
+        # Merges the new rows into the summary on main; the first write bootstraps it from the stored rows once
+        storage_options = self.storage_options(lakefs_endpoint)
+        fs = self.filesystem(lakefs_endpoint)
+        fs.invalidate_cache()
+        summary_path = f"{lakefs_s3_path}{DATASET_SUMMARY_SUFFIX}"
+        if fs.exists(summary_path):
+            with fs.open(summary_path, "r") as f:
+                existing = json.load(f)
+        elif fs.exists(lakefs_s3_path):
+            logger.info(f"Building {summary_path} from the stored rows")
+            existing = dataset_summary(pd.read_parquet(lakefs_s3_path, columns=["tag", "postTimeRaw"], storage_options=storage_options, engine='pyarrow'))
         else:
-            new_unique_data = data.merge(
-                data_in_lakefs,
-                on=["postTimeRaw", "username", "tweetText"],    
-                how="left",
-                indicator=True
-            ).query('_merge == "left_only"').drop(columns=['_merge'])
-
-        cols = [col for col in new_unique_data.columns if not col.endswith('_y')]
-        new_cleaned_df = new_unique_data[cols].copy()
-        new_cleaned_df.columns = [col.replace('_x', '') for col in new_cleaned_df.columns]
-
-        if len(new_cleaned_df) > 0:
-            logger.info(new_cleaned_df)
-            logger.info(f"Number of new records: {len(new_cleaned_df)}")
+            existing = dataset_summary(data.iloc[0:0])
+        summary = merge_summaries(existing, dataset_summary(data))
+        with fs.open(self.on_branch(summary_path, branch), "w") as f:
+            json.dump(summary, f, ensure_ascii=False)
+        return summary
+
+    def find_new_rows(self, data: pd.DataFrame, lakefs_endpoint: str, lakefs_s3_path: str = lakefs_s3_path, key_columns: list[str] | None = None) -> tuple[pd.DataFrame, dict]:
+        storage_options = self.storage_options(lakefs_endpoint)
+        fs = self.filesystem(lakefs_endpoint)
+
+        batch = backfill_tweet_ids(data)
+        missing_id = batch["tweet_id"].isna()
+        if missing_id.any():
+            logger.warning(f"Skipping {missing_id.sum()} rows without a tweet id")
+            batch = batch[~missing_id]
+        # Repeats inside the batch collapse on the dataset's natural key; stored rows are matched by (tweet_id, tag) below
+        key_columns = key_columns or ROW_KEYS.get(lakefs_s3_path, FINGERPRINT_COLUMNS)
+        batch = batch[~duplicated_keys(batch, key_columns)]
+
+        # Only the day partitions touched by this batch are consulted
+        new_parts, shard_updates = [], {}
+        for (year, month, day), group in batch.groupby(["year", "month", "day"]):
+            known = self.load_dedup_shard(fs, lakefs_s3_path, year, month, day, storage_options)
+            fresh = group[~is_stored(group, known)]
+            if len(fresh) > 0:
+                new_parts.append(fresh)
+                shard_updates[(year, month, day)] = shard_keys(pd.concat([known, fresh[SHARD_COLUMNS]]) if len(known) else fresh)
+
+        if not new_parts:
+            return data.iloc[0:0], {}
+        return pd.concat(new_parts), shard_updates
+
+    def filter_new(self, data: pd.DataFrame, lakefs_endpoint: str, lakefs_s3_path: str = lakefs_s3_path) -> pd.DataFrame:
+        # Read-only check against the dedup index, e.g. to skip already stored tweets before classification
+        new_rows, _ = self.find_new_rows(data, lakefs_endpoint, lakefs_s3_path)
+        logger.info(f"{len(new_rows)} of {len(data)} rows are not in {lakefs_s3_path} yet.")
+        return new_rows
+
+    def incremental_load(self, data: pd.DataFrame, lakefs_endpoint: str, lakefs_s3_path: str = lakefs_s3_path) -> pd.DataFrame:
+        storage_options = self.storage_options(lakefs_endpoint)
+        new_cleaned_df, shard_updates = self.find_new_rows(data, lakefs_endpoint, lakefs_s3_path)
+        if new_cleaned_df.empty:
+            logger.info("No new records found.")
+            return new_cleaned_df
+
+        logger.info(new_cleaned_df)
+        logger.info(f"Number of new records: {len(new_cleaned_df)}")
+        # Data files, dedup shards and derived counts land in one commit, so readers never see half a batch
+        metadata = self.commit_metadata(new_cleaned_df)
+        with self.staging_branch(self.repository_of(lakefs_s3_path), message=f"Append {len(new_cleaned_df)} rows to {lakefs_s3_path}", metadata=metadata) as branch:
+            staged_path = self.on_branch(lakefs_s3_path, branch)
             new_cleaned_df.to_parquet(
-                lakefs_s3_path,
+                staged_path,
                 storage_options=storage_options,
                 partition_cols=['year', 'month', 'day'],
                 engine='pyarrow',
+                schema=arrow_schema(new_cleaned_df),
             )
+            self.write_dedup_shards(staged_path, shard_updates, storage_options)
+            self.update_dataset_summary(new_cleaned_df, lakefs_endpoint, lakefs_s3_path, branch)
+            self.update_derived(new_cleaned_df, lakefs_endpoint, lakefs_s3_path, branch)
 
-            logger.info(f"Data uploaded successfully to {lakefs_s3_path} with {len(new_cleaned_df)} records.")
-        else:
-            logger.info("No new records found.")
+        logger.info(f"Data uploaded successfully to {lakefs_s3_path} with {len(new_cleaned_df)} records ({len(shard_updates)} partitions).")
+        return new_cleaned_df
+
+    def update_derived(self, new_rows: pd.DataFrame, lakefs_endpoint: str, dataset_s3_path: str, branch: str) -> None:
+        # Derived datasets share the repository of their source, so they are written on its staging branch
+        if dataset_s3_path == lakefs_s3_path:
+            self.update_rollup(new_rows, lakefs_endpoint, branch, lakefs_s3_path=dataset_s3_path)
+        elif dataset_s3_path == lakefs_s3_path_ml:
+            self.update_subtopic_counts(new_rows, lakefs_endpoint, branch, lakefs_s3_path=dataset_s3_path)
+            self.update_subtopic_index(new_rows, lakefs_endpoint, branch, lakefs_s3_path=dataset_s3_path)
+
+    def update_counts(self, new_rows: pd.DataFrame, lakefs_endpoint: str, source_s3_path: str, counts_s3_path: str, count_rows, keys: list[str], source_columns: list[str], branch: str) -> int:
+        # Every touched day is recounted from the staged source partition, new_rows included, rather than
+        # merged into the stored counts: nothing is counted twice and no partition stays short
+        if new_rows.empty:
+            logger.info(f"No new rows, {counts_s3_path} unchanged.")
+            return 0
+
+        storage_options = self.storage_options(lakefs_endpoint)
+        staged_source = self.on_branch(source_s3_path, branch)
+        partitions = list(new_rows[PARTITION_COLUMNS].drop_duplicates().itertuples(index=False, name=None))
+        for year, month, day in partitions:
+            counts = self.recount_partition(staged_source, year, month, day, count_rows, keys, source_columns, storage_options)
+            if counts.empty:
+                continue
+            counts.to_parquet(
+                self.on_branch(self.partition_path(counts_s3_path, year, month, day) + "/counts.parquet", branch),
+                storage_options=storage_options,
+                engine='pyarrow',
+                index=False,
+            )
+        logger.info(f"{counts_s3_path} recounted for {len(partitions)} partitions.")
+        return len(partitions)
+
+    def recount_partition(self, source_s3_path: str, year: int, month: int, day: int, count_rows, keys: list[str], source_columns: list[str], storage_options: dict) -> pd.DataFrame:
+        source_partition = pd.read_parquet(self.partition_path(source_s3_path, year, month, day), columns=source_columns, storage_options=storage_options, engine='pyarrow')
+        counts = count_rows(source_partition)
+        return counts if counts.empty else merge_counts(keys, counts)
+
+    def backfill_counts(self, lakefs_endpoint: str, source_s3_path: str, counts_s3_path: str, count_rows, keys: list[str], source_columns: list[str]) -> int:
+        # One-off rebuild of every count partition from the full source history, in a single commit
+        partitions = self.day_partitions(lakefs_endpoint, source_s3_path)
+        if not partitions:
+            logger.info(f"No partitions under {source_s3_path}, nothing to backfill.")
+            return 0
+
+        storage_options = self.storage_options(lakefs_endpoint)
+        with self.staging_branch(self.repository_of(counts_s3_path), message=f"Backfill {counts_s3_path} from {len(partitions)} partitions of {source_s3_path}", metadata={"partitions": len(partitions), "flow_run_id": flow_run.id or ""}, prefix="backfill") as branch:
+            for year, month, day in partitions:
+                counts = self.recount_partition(source_s3_path, year, month, day, count_rows, keys, source_columns, storage_options)
+                if counts.empty:
+                    continue
+                counts.to_parquet(
+                    self.on_branch(self.partition_path(counts_s3_path, year, month, day) + "/counts.parquet", branch),
+                    storage_options=storage_options,
+                    engine='pyarrow',
+                    index=False,
+                )
+                logger.debug(f"Backfilled {len(counts)} counts for {year}-{month}-{day}")
+        logger.info(f"Backfilled {counts_s3_path} from {len(partitions)} partitions of {source_s3_path}.")
+        return len(partitions)
+
+    def backfill_rollup(self, lakefs_endpoint: str, lakefs_s3_path: str = lakefs_s3_path, rollup_s3_path: str = lakefs_s3_path_rollup) -> int:
+        return self.backfill_counts(lakefs_endpoint, lakefs_s3_path, rollup_s3_path, rollup_counts, ROLLUP_KEYS, ROLLUP_SOURCE_COLUMNS)
+
+    def backfill_subtopic_counts(self, lakefs_endpoint: str, lakefs_s3_path: str = lakefs_s3_path_ml, counts_s3_path: str = lakefs_s3_path_subtopics) -> int:
+        return self.backfill_counts(lakefs_endpoint, lakefs_s3_path, counts_s3_path, subtopic_counts, SUBTOPIC_KEYS, SUBTOPIC_SOURCE_COLUMNS)
+
+    def backfill_subtopic_index(self, lakefs_endpoint: str, lakefs_s3_path: str = lakefs_s3_path_ml, index_s3_path: str = lakefs_s3_path_subtopic_index) -> int:
+        # One-off rebuild from every word cloud partition; each index partition is replaced by a single file
+        partitions = self.day_partitions(lakefs_endpoint, lakefs_s3_path)
+        if not partitions:
+            logger.info(f"No partitions under {lakefs_s3_path}, nothing to backfill.")
+            return 0
+
+        storage_options = self.storage_options(lakefs_endpoint)
+        fs = self.filesystem(lakefs_endpoint)
+        with self.staging_branch(self.repository_of(index_s3_path), message=f"Backfill {index_s3_path} from {len(partitions)} partitions of {lakefs_s3_path}", metadata={"partitions": len(partitions), "flow_run_id": flow_run.id or ""}, prefix="backfill") as branch:
+            for year, month, day in partitions:
+                entries = self.rewrite_index_partition(fs, lakefs_s3_path, index_s3_path, year, month, day, branch, storage_options)
+                logger.debug(f"Backfilled {entries} subtopic entries for {year}-{month}-{day}")
+        logger.info(f"Backfilled {index_s3_path} from {len(partitions)} partitions of {lakefs_s3_path}.")
+        return len(partitions)
+
+    def rewrite_index_partition(self, fs, source_s3_path: str, index_s3_path: str, year: int, month: int, day: int, branch: str, storage_options: dict) -> int:
+        # Replaces one day of the index with a single file; rows written before tweet_id existed still carry tweet_link
+        rows = backfill_tweet_ids(pd.read_parquet(self.partition_path(source_s3_path, year, month, day), storage_options=storage_options, engine='pyarrow'))
+        index = subtopic_index(rows.assign(year=year, month=month, day=day)).drop(columns=PARTITION_COLUMNS)
+        staged_partition = self.on_branch(self.partition_path(index_s3_path, year, month, day), branch)
+        if fs.exists(staged_partition):
+            fs.rm(staged_partition, recursive=True)
+        if index.empty:
+            return 0
+        index.to_parquet(
+            f"{staged_partition}/index.parquet",
+            storage_options=storage_options,
+            engine='pyarrow',
+            index=False,
+            schema=arrow_schema(index),
+        )
+        return len(index)
+
+    def update_rollup(self, new_rows: pd.DataFrame, lakefs_endpoint: str, branch: str, lakefs_s3_path: str = lakefs_s3_path, rollup_s3_path: str = lakefs_s3_path_rollup) -> int:
+        return self.update_counts(new_rows, lakefs_endpoint, lakefs_s3_path, rollup_s3_path, rollup_counts, ROLLUP_KEYS, ROLLUP_SOURCE_COLUMNS, branch)
+
+    def update_subtopic_counts(self, new_rows: pd.DataFrame, lakefs_endpoint: str, branch: str, lakefs_s3_path: str = lakefs_s3_path_ml, counts_s3_path: str = lakefs_s3_path_subtopics) -> int:
+        return self.update_counts(new_rows, lakefs_endpoint, lakefs_s3_path, counts_s3_path, subtopic_counts, SUBTOPIC_KEYS, SUBTOPIC_SOURCE_COLUMNS, branch)
+
+    def update_subtopic_index(self, new_rows: pd.DataFrame, lakefs_endpoint: str, branch: str, lakefs_s3_path: str = lakefs_s3_path_ml, index_s3_path: str = lakefs_s3_path_subtopic_index) -> int:
+        # Touched days are rewritten as one file each from the staged word cloud, so the index never piles up small files
+        if new_rows.empty:
+            logger.info(f"No new rows, {index_s3_path} unchanged.")
+            return 0
+
+        storage_options = self.storage_options(lakefs_endpoint)
+        fs = self.filesystem(lakefs_endpoint)
+        fs.invalidate_cache()
+        staged_source = self.on_branch(lakefs_s3_path, branch)
+        partitions = list(new_rows[PARTITION_COLUMNS].drop_duplicates().itertuples(index=False, name=None))
+        entries = sum(self.rewrite_index_partition(fs, staged_source, index_s3_path, year, month, day, branch, storage_options) for year, month, day in partitions)
+        logger.info(f"Rewrote {len(partitions)} partitions of {index_s3_path} with {entries} subtopic entries.")
+        return entries
 
 if __name__ == "__main__":
-    loader = LakeFSLoader(host="http://lakefs_db:8000")
+    loader = get_loader(host="http://lakefs_db:8000")
     loader.connect()
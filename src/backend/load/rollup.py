@@ -0,0 +1,75 @@
+import pandas as pd
+
+# Import dataset fingerprinting
+from src.backend.load.fingerprint import PARTITION_COLUMNS
+# Import path configuration
+from config.path_config import ROLLUP_FREQ, tags as configured_tags
+
+ROLLUP_KEYS = ["bucket", "category", "tag"]
+ROLLUP_SOURCE_COLUMNS = ["postTimeRaw", "category", "tag"]
+SUBTOPIC_KEYS = ["bucket", "tag", "subtopic"]
+SUBTOPIC_SOURCE_COLUMNS = ["postTimeRaw", "tag", "subtopic"]
+SUBTOPIC_INDEX_COLUMNS = ["postTimeRaw", "tag", "subtopic", "tweet_id"]
+
+def bucket_counts(df: pd.DataFrame, keys: list[str], freq: str = ROLLUP_FREQ) -> pd.DataFrame:
+    if df.empty:
+        return pd.DataFrame(columns=keys + ["count"] + PARTITION_COLUMNS)
+    counts = (
+        df.assign(bucket=pd.to_datetime(df["postTimeRaw"]).dt.floor(freq))
+        .groupby(keys, observed=True)
+        .size()
+        .rename("count")
+        .reset_index()
+    )
+    # A bucket never crosses midnight, so it belongs to exactly one day partition
+    counts["year"] = counts["bucket"].dt.year
+    counts["month"] = counts["bucket"].dt.month
+    counts["day"] = counts["bucket"].dt.day
+    return counts
+
+def rollup_counts(df: pd.DataFrame, freq: str = ROLLUP_FREQ) -> pd.DataFrame:
+    return bucket_counts(df, ROLLUP_KEYS, freq)
+
+def tag_stop_words(tag_values) -> set[str]:
+    # Hashtag words would dominate every word cloud, so they never count as subtopics
+    all_tags = [tag for category_tags in configured_tags.values() for tag in category_tags]
+    return {word.strip() for tag in [*all_tags, *tag_values] for word in str(tag).split("#") if word.strip()}
+
+def explode_subtopics(df: pd.DataFrame, columns: list[str]) -> pd.DataFrame:
+    exploded = df[columns].explode("subtopic").dropna(subset=["subtopic"])
+    return exploded[~exploded["subtopic"].isin(tag_stop_words(df["tag"].dropna().unique()))]
+
+def subtopic_counts(df: pd.DataFrame, freq: str = ROLLUP_FREQ) -> pd.DataFrame:
+    if df.empty:
+        return bucket_counts(df, SUBTOPIC_KEYS, freq)
+    return bucket_counts(explode_subtopics(df, SUBTOPIC_SOURCE_COLUMNS), SUBTOPIC_KEYS, freq)
+
+def subtopic_index(df: pd.DataFrame) -> pd.DataFrame:
+    # One row per (subtopic, tweet, tag): a word-cloud click becomes a filtered lookup for the selected tags
+    if df.empty or "tweet_id" not in df.columns:
+        return pd.DataFrame(columns=SUBTOPIC_INDEX_COLUMNS + PARTITION_COLUMNS)
+    index = explode_subtopics(df, SUBTOPIC_INDEX_COLUMNS + PARTITION_COLUMNS).dropna(subset=["tweet_id"])
+    return index.drop_duplicates(subset=["subtopic", "tweet_id", "tag"])
+
+def merge_counts(keys: list[str], *counts: pd.DataFrame) -> pd.DataFrame:
+    merged = pd.concat([count for count in counts if not count.empty])
+    return merged.groupby(keys, observed=True, as_index=False)["count"].sum()
+
+def dataset_summary(df: pd.DataFrame) -> dict:
+    if df.empty:
+        return {"tags": [], "min_post_time": None, "max_post_time": None}
+    post_times = pd.to_datetime(df["postTimeRaw"])
+    return {
+        "tags": sorted(str(tag) for tag in df["tag"].dropna().unique()),
+        "min_post_time": post_times.min().isoformat(),
+        "max_post_time": post_times.max().isoformat(),
+    }
+
+def merge_summaries(*summaries: dict) -> dict:
+    min_times = [pd.Timestamp(summary["min_post_time"]) for summary in summaries if summary["min_post_time"]]
+    max_times = [pd.Timestamp(summary["max_post_time"]) for summary in summaries if summary["max_post_time"]]
+    return {
+        "tags": sorted({tag for summary in summaries for tag in summary["tags"]}),
+        "min_post_time": min(min_times).isoformat() if min_times else None,
+        "max_post_time": max(max_times).isoformat() if max_times else None,
+    }
@@ -0,0 +1,46 @@
+import pandas as pd
+import pyarrow as pa
+
+# Low-cardinality strings are dictionary-encoded: one copy per distinct value instead of per row
+DICTIONARY_STRING = pa.dictionary(pa.int32(), pa.string())
+
+TWEET_FIELDS = {
+    "category": DICTIONARY_STRING,
+    "tag": DICTIONARY_STRING,
+    "username": DICTIONARY_STRING,
+    "tweetText": pa.string(),
+    "tweet_link": pa.string(),
+    "tweet_id": pa.int64(),
+    "postTimeRaw": pa.timestamp("ms"),
+    "scrapeTime": pa.timestamp("ms"),
+    "year": pa.int16(),
+    "month": pa.int8(),
+    "day": pa.int8(),
+}
+
+TWEET_DTYPES = {
+    "category": "category",
+    "tag": "category",
+    "username": "category",
+    "tweetText": "string[pyarrow]",
+    "tweet_link": "string[pyarrow]",
+    "tweet_id": "int64",
+    "postTimeRaw": "datetime64[ms]",
+    "scrapeTime": "datetime64[ms]",
+    "year": "int16",
+    "month": "int8",
+    "day": "int8",
+}
+
+def apply_dtypes(df: pd.DataFrame) -> pd.DataFrame:
+    return df.astype({column: dtype for column, dtype in TWEET_DTYPES.items() if column in df.columns})
+
+def conform_schema(schema: pa.Schema) -> pa.Schema:
+    # Known tweet columns get the shared types, anything else keeps its own
+    return pa.schema([pa.field(field.name, TWEET_FIELDS.get(field.name, field.type)) for field in schema])
+
+def arrow_schema(df: pd.DataFrame) -> pa.Schema:
+    return conform_schema(pa.Schema.from_pandas(df, preserve_index=False))
+
+def conform_table(table: pa.Table) -> pa.Table:
+    return table.cast(conform_schema(table.schema))
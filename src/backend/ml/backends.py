@@ -0,0 +1,138 @@
+import os, json
+from abc import ABC, abstractmethod
+import random
+import re
+import threading
+import time
+from dotenv import load_dotenv
+from google import genai
+from google.genai import types, errors
+from src.backend.ml.config_ml import instruction, prompt_template, gemini_model
+# Import token estimate used for batching
+from src.backend.ml.batching import estimate_tokens, MESSAGE_OVERHEAD_TOKENS
+# Import modern logging configuration
+from config.logging.modern_log import LoggingConfig
+
+logger = LoggingConfig(level="DEBUG", level_console="INFO").get_logger()
+
+load_dotenv()
+
+RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+
+class ClassifierBackend(ABC):
+    # Classifies one packed batch of {"index", "tweetText"} rows into a {"faq": [...], "issue": [...]} response.
+    # `model` is part of the cache key, so results of different backends never mix.
+    model = ""
+
+    def __init__(self):
+        self.calls = 0
+        self.rows_sent = 0
+        self.tokens_sent = 0
+        self.stats_lock = threading.Lock()
+
+    def record_call(self, tweets_eles: list) -> None:
+        # Batches run on several threads at once
+        with self.stats_lock:
+            self.calls += 1
+            self.rows_sent += len(tweets_eles)
+            self.tokens_sent += sum(estimate_tokens(row['tweetText']) + MESSAGE_OVERHEAD_TOKENS for row in tweets_eles)
+
+    @abstractmethod
+    def classify_messages(self, tweets_eles: list, faq_topic: str = "", faq_subtopic: str = "", issue_topic: str = "", issue_subtopic: str = "") -> dict:
+        ...
+
+class GeminiBackend(ClassifierBackend):
+    def __init__(self, model: str = gemini_model, max_retries: int = 5, backoff_base: float = 2.0):
+        super().__init__()
+        self.client = genai.Client(api_key=os.getenv("GEMINI_API_KEY"))
+        self.model = model
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+
+    def generate(self, tweets_eles: list, faq_topic: str, faq_subtopic: str, issue_topic: str, issue_subtopic: str) -> dict:
+        prompt_formatted = prompt_template.format(
+            faq_topic = faq_topic,
+            faq_subtopic = faq_subtopic,
+            issue_topic = issue_topic,
+            issue_subtopic = issue_subtopic,
+            messages="\n".join([f"{row['index']}: {row['tweetText']}" for row in tweets_eles]),
+        )
+        response = self.client.models.generate_content(
+            model=self.model,
+            contents=prompt_formatted,
+            config=types.GenerateContentConfig(
+                system_instruction=instruction,
+                temperature=0.2, # low temperature for more deterministic output kub
+            ),
+        )
+        response_text = response.text
+        response_json = response_text[response_text.index("{"): response_text.rindex("}") + 1]
+        response_json = response_json.replace("{{", "{").replace("}}", "}")
+        response_json = json.loads(response_json, strict=False)
+        return response_json
+
+    def classify_messages(self, tweets_eles: list, faq_topic: str = "", faq_subtopic: str = "", issue_topic: str = "", issue_subtopic: str = "") -> dict:
+        self.record_call(tweets_eles)
+        for attempt in range(self.max_retries + 1):
+            try:
+                return self.generate(tweets_eles, faq_topic, faq_subtopic, issue_topic, issue_subtopic)
+            except errors.APIError as e:
+                if e.code not in RETRYABLE_STATUS or attempt == self.max_retries:
+                    raise
+                delay = self.backoff_base * 2 ** attempt * (1 + random.random())
+                logger.warning(f"Gemini returned {e.code}, retrying in {delay:.1f}s (attempt {attempt + 1}/{self.max_retries})")
+                time.sleep(delay)
+
+# keyword -> (topic, subtopic); the first keyword found in a tweet wins
+KEYWORD_TOPICS = {
+    "tcas": ("การรับสมัคร", "TCAS"),
+    "portfolio": ("การรับสมัคร", "พอร์ตโฟลิโอ"),
+    "พอร์ต": ("การรับสมัคร", "พอร์ตโฟลิโอ"),
+    "สัมภาษณ์": ("การรับสมัคร", "การสอบสัมภาษณ์"),
+    "สมัคร": ("การรับสมัคร", "การสมัครเรียน"),
+    "ยืนยันสิทธิ์": ("การรับสมัคร", "การยืนยันสิทธิ์"),
+    "ลงทะเบียน": ("การลงทะเบียนเรียน", "การลงทะเบียน"),
+    "ถอนวิชา": ("การลงทะเบียนเรียน", "การถอนรายวิชา"),
+    "ค่าเทอม": ("ค่าใช้จ่าย", "ค่าเทอม"),
+    "ทุน": ("ค่าใช้จ่าย", "ทุนการศึกษา"),
+    "กยศ": ("ค่าใช้จ่าย", "กยศ."),
+    "หอ": ("ที่พัก", "หอพัก"),
+    "รถตู้": ("การเดินทาง", "รถตู้"),
+    "รถ": ("การเดินทาง", "รถรับส่ง"),
+    "สอบ": ("การเรียน", "การสอบ"),
+    "เกรด": ("การเรียน", "ผลการเรียน"),
+    "อาจารย์": ("การเรียน", "อาจารย์ผู้สอน"),
+    "ห้องสมุด": ("สิ่งอำนวยความสะดวก", "ห้องสมุด"),
+    "wifi": ("สิ่งอำนวยความสะดวก", "อินเทอร์เน็ต"),
+    "เน็ต": ("สิ่งอำนวยความสะดวก", "อินเทอร์เน็ต"),
+    "แอร์": ("สิ่งอำนวยความสะดวก", "อาคารเรียน"),
+    "โรงอาหาร": ("สิ่งอำนวยความสะดวก", "โรงอาหาร"),
+    "รับปริญญา": ("กิจกรรม", "พิธีรับปริญญา"),
+    "รับน้อง": ("กิจกรรม", "รับน้อง"),
+}
+QUESTION_PATTERN = re.compile(r"\?|ไหม|มั้ย|มั๊ย|อะไร|ยังไง|อย่างไร|เมื่อไหร่|ที่ไหน|กี่|หรือเปล่า|รึเปล่า|ป่าว")
+
+class KeywordBackend(ClassifierBackend):
+    # Deterministic offline stand-in: same input, same output, no network. Questions become
+    # faq entries, everything else that matches a keyword becomes an issue.
+    model = "keyword-v1"
+
+    def __init__(self, latency: float = 0.0, keyword_topics: dict[str, tuple[str, str]] = KEYWORD_TOPICS):
+        super().__init__()
+        # Optional sleep per call, to stand in for the network round trip when benchmarking concurrency
+        self.latency = latency
+        self.keyword_topics = keyword_topics
+
+    def classify_messages(self, tweets_eles: list, faq_topic: str = "", faq_subtopic: str = "", issue_topic: str = "", issue_subtopic: str = "") -> dict:
+        self.record_call(tweets_eles)
+        if self.latency:
+            time.sleep(self.latency)
+        response = {"issue": [], "faq": []}
+        for row in tweets_eles:
+            text = str(row['tweetText']).lower()
+            match = next((pair for keyword, pair in self.keyword_topics.items() if keyword in text), None)
+            if match is None:
+                continue
+            kind = "faq" if QUESTION_PATTERN.search(text) else "issue"
+            response[kind].append({"index": row['index'], "text": row['tweetText'], "topic": [match[0]], "subtopic": [match[1]]})
+        return response
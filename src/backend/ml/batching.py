@@ -0,0 +1,41 @@
+import math
+import re
+from collections import Counter
+
+# Rough Gemini tokenizer ratios: Thai script packs far fewer characters into a token than Latin text
+THAI_CHARS_PER_TOKEN = 2.5
+OTHER_CHARS_PER_TOKEN = 4.0
+THAI_PATTERN = re.compile(r"[\u0e00-\u0e7f]")
+# Per-message overhead: index prefix and newline
+MESSAGE_OVERHEAD_TOKENS = 4
+
+def estimate_tokens(text: str) -> int:
+    text = str(text)
+    thai_chars = len(THAI_PATTERN.findall(text))
+    other_chars = len(text) - thai_chars - text.count(" ")
+    return math.ceil(thai_chars / THAI_CHARS_PER_TOKEN + other_chars / OTHER_CHARS_PER_TOKEN)
+
+def pack_batches(rows: list[dict], budget_tokens: int = 3000, max_rows: int = 60, text_key: str = "tweetText") -> list[list[dict]]:
+    # Greedy, order-preserving: a batch closes when the next message would overflow the budget
+    batches, batch, batch_tokens = [], [], 0
+    for row in rows:
+        tokens = estimate_tokens(row[text_key]) + MESSAGE_OVERHEAD_TOKENS
+        if batch and (batch_tokens + tokens > budget_tokens or len(batch) >= max_rows):
+            batches.append(batch)
+            batch, batch_tokens = [], 0
+        batch.append(row)
+        batch_tokens += tokens
+    if batch:
+        batches.append(batch)
+    return batches
+
+def cap_vocabulary(vocabulary: Counter, max_items: int = 40, max_tokens: int = 300) -> list[str]:
+    # Keep the most used topics only, so the prompt stops growing with the topic set
+    kept, used_tokens = [], 0
+    for topic, _ in vocabulary.most_common():
+        tokens = estimate_tokens(topic) + 1
+        if len(kept) >= max_items or used_tokens + tokens > max_tokens:
+            break
+        kept.append(topic)
+        used_tokens += tokens
+    return kept
@@ -0,0 +1,93 @@
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import time
+import unicodedata
+from contextlib import closing
+
+# Import modern logging configuration
+from config.logging.modern_log import LoggingConfig
+# Import path configuration
+from config.path_config import CLASSIFY_CACHE
+from src.backend.ml.config_ml import instruction, prompt_template, gemini_model
+
+logger = LoggingConfig(level="DEBUG", level_console="INFO").get_logger()
+
+# Any prompt edit changes the version, so stale classifications are never served
+PROMPT_VERSION = hashlib.sha256((instruction + prompt_template).encode("utf-8")).hexdigest()[:12]
+
+def normalize_text(text: str) -> str:
+    return re.sub(r"\s+", " ", unicodedata.normalize("NFC", str(text))).strip().lower()
+
+def cache_key(text: str, prompt_version: str = PROMPT_VERSION, model: str = gemini_model) -> str:
+    return hashlib.sha256(f"{model}\0{prompt_version}\0{normalize_text(text)}".encode("utf-8")).hexdigest()
+
+def results_by_index(response: dict) -> dict[int, dict]:
+    # Regroup one LLM response into a {"faq": [...], "issue": [...]} result per message index
+    results = {}
+    for kind in ("faq", "issue"):
+        for entry in response.get(kind, []):
+            try:
+                index = int(entry["index"])
+            except (KeyError, TypeError, ValueError):
+                continue
+            result = results.setdefault(index, {"faq": [], "issue": []})
+            result[kind].append({"topic": entry.get("topic", []), "subtopic": entry.get("subtopic", [])})
+    return results
+
+class ClassificationCache:
+    def __init__(self, path: str = CLASSIFY_CACHE, max_entries: int = 200_000):
+        self.path = path
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with closing(self._connect()) as conn, conn:
+            conn.executescript("""
+                CREATE TABLE IF NOT EXISTS classifications (
+                    key TEXT PRIMARY KEY,
+                    result TEXT NOT NULL,
+                    last_used REAL NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS idx_classifications_last_used ON classifications (last_used);
+            """)
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.path, timeout=30)
+
+    def get_many(self, keys: list[str]) -> dict[str, dict]:
+        keys = list(dict.fromkeys(keys))
+        found = {}
+        with closing(self._connect()) as conn, conn:
+            # Stay below SQLite's bound-parameter limit
+            for start in range(0, len(keys), 500):
+                batch = keys[start:start + 500]
+                placeholders = ",".join("?" * len(batch))
+                rows = conn.execute(f"SELECT key, result FROM classifications WHERE key IN ({placeholders})", batch).fetchall()
+                found.update({key: json.loads(result) for key, result in rows})
+                conn.execute(f"UPDATE classifications SET last_used = ? WHERE key IN ({placeholders})", [time.time(), *batch])
+        self.hits += len(found)
+        self.misses += len(keys) - len(found)
+        logger.info(f"Classification cache: {len(found)} hits, {len(keys) - len(found)} misses")
+        return found
+
+    def put_many(self, results: dict[str, dict]) -> None:
+        if not results:
+            return
+        now = time.time()
+        with closing(self._connect()) as conn, conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO classifications (key, result, last_used) VALUES (?, ?, ?)",
+                [(key, json.dumps(result, ensure_ascii=False), now) for key, result in results.items()],
+            )
+            # Least recently used entries go first once the cache is full
+            count = conn.execute("SELECT COUNT(*) FROM classifications").fetchone()[0]
+            if count > self.max_entries:
+                conn.execute("""
+                    DELETE FROM classifications WHERE key IN (
+                        SELECT key FROM classifications ORDER BY last_used ASC LIMIT ?
+                    )
+                """, (count - self.max_entries,))
+                logger.info(f"Evicted {count - self.max_entries} entries from the classification cache")
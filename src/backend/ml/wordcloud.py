@@ -1,48 +1,40 @@
-import os, json
-from dotenv import load_dotenv
-from google import genai
-from google.genai import types
-from src.backend.ml.config_ml import instruction, prompt_template
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+# Import classifier backends
+from src.backend.ml.backends import ClassifierBackend, GeminiBackend
+# Import classification cache
+from src.backend.ml.classify_cache import ClassificationCache, cache_key, results_by_index
+# Import token-budget batching
+from src.backend.ml.batching import pack_batches, cap_vocabulary
 import pandas as pd
 import hashlib
 
 # Import path configuration
 from config.path_config import lakefs_s3_path_ml, lakefs_s3_path
 # Import LakeFS loader
-from src.backend.load.lakefs_loader import LakeFSLoader
+from src.backend.load.lakefs_loader import get_loader
 # Import modern logging configuration
 from config.logging.modern_log import LoggingConfig
 
 logger = LoggingConfig(level="DEBUG", level_console="INFO").get_logger()
 
-load_dotenv()
-
 class WordCloud:
-    def __init__(self):
-        self.client = genai.Client(api_key=os.getenv("GEMINI_API_KEY"))
-    
-    def classify_messages(self, tweets_eles: list, faq_topic: str, faq_subtopic: str, issue_topic: str, issue_subtopic: str ) -> dict:
-        prompt_formatted = prompt_template.format(
-            faq_topic = faq_topic,
-            faq_subtopic = faq_subtopic,
-            issue_topic = issue_topic,
-            issue_subtopic = issue_subtopic,
-            messages="\n".join([f"{row['index']}: {row['tweetText']}" for row in tweets_eles]),
-        )
-        response = self.client.models.generate_content(
-            model="gemini-2.0-flash",
-            contents=prompt_formatted,
-            config=types.GenerateContentConfig(
-                system_instruction=instruction,
-                temperature=0.2, # low temperature for more deterministic output kub
-            ),
-        )
-        response_text = response.text
-        response_json = response_text[response_text.index("{"): response_text.rindex("}") + 1]
-        response_json = response_json.replace("{{", "{").replace("}}", "}")
-        response_json = json.loads(response_json, strict=False)
-        return response_json
-    
+    def __init__(self, backend: ClassifierBackend | None = None, concurrency: int = 4, cache: ClassificationCache | None = None, batch_token_budget: int = 3000, max_batch_rows: int = 60):
+        self.backend = backend or GeminiBackend()
+        self.batch_token_budget = batch_token_budget
+        self.max_batch_rows = max_batch_rows
+        self.cache = cache or ClassificationCache()
+        self.concurrency = concurrency
+
+    @staticmethod
+    def update_vocabulary(response: dict, faq_topic: Counter, faq_subtopic: Counter, issue_topic: Counter, issue_subtopic: Counter) -> None:
+        for row in response['issue']:
+            issue_topic.update(row['topic'])
+            issue_subtopic.update(row['subtopic'])
+        for row in response['faq']:
+            faq_topic.update(row['topic'])
+            faq_subtopic.update(row['subtopic'])
+
     def remove_stop_words_from_text(self, text, stop_words):
         if isinstance(text, list):
             return [word for word in text if word not in stop_words]
@@ -56,42 +48,57 @@ class WordCloud:
         df.drop_duplicates(subset="tweetText", inplace=True)
         df['index'] = df.index + 1
         df_dict:dict = df[['postTimeRaw', 'tweetText', 'index']].to_dict(orient='records')
-        step = 20
-        prev_stop = 0
 
-        all_response = []
-        faq_topic, faq_subtopic = set(), set()
-        issue_topic, issue_subtopic = set(), set()
-        
-        for ind in range(step, len(df_dict) + step, step):
-            start = prev_stop
-            stop = ind
-            prev_stop = stop
-            rows = df_dict[start:stop]
-            logger.info(f"Processing rows {start} to {stop}")
-            
-            response = self.classify_messages(tweets_eles=rows, faq_topic=faq_topic, faq_subtopic=faq_subtopic, issue_topic=issue_topic, issue_subtopic=issue_subtopic)
-            
-            for row in response['issue']:
-                for topic in row['topic']:
-                    issue_topic.add(topic)
-                for subtopic in row['subtopic']:
-                    issue_subtopic.add(subtopic)
-            for row in response['faq']:
-                for topic in row['topic']:
-                    faq_topic.add(topic)
-                for subtopic in row['subtopic']:
-                    faq_subtopic.add(subtopic)
-            
-            all_response.append(response)
-        faqs = [faq for response in all_response for faq in response['faq']]
-        faqs_df = pd.DataFrame(faqs)
+        # Only tweets never classified under the current prompt and backend model go to the backend
+        keys = {row['index']: cache_key(row['tweetText'], model=self.backend.model) for row in df_dict}
+        cached = self.cache.get_many(list(keys.values()))
+        results = {index: cached[key] for index, key in keys.items() if key in cached}
+        misses = [row for row in df_dict if row['index'] not in results]
+
+        faq_topic, faq_subtopic = Counter(), Counter()
+        issue_topic, issue_subtopic = Counter(), Counter()
+        for result in results.values():
+            self.update_vocabulary(result, faq_topic, faq_subtopic, issue_topic, issue_subtopic)
+
+        # Batches are packed up to a token budget instead of a fixed number of tweets
+        batches = pack_batches(misses, budget_tokens=self.batch_token_budget, max_rows=self.max_batch_rows)
+        offsets = [0]
+        for batch in batches[:-1]:
+            offsets.append(offsets[-1] + len(batch))
+        chunks = list(zip(offsets, batches))
+        logger.info(f"Packed {len(misses)} uncached tweets into {len(batches)} prompts")
+        # Chunks run `concurrency` at a time; each wave sees the topics found by all earlier waves
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            for wave_start in range(0, len(chunks), self.concurrency):
+                wave = chunks[wave_start:wave_start + self.concurrency]
+                # Only the most frequent topics are carried into the prompt, keeping its size bounded
+                vocabulary = tuple(", ".join(cap_vocabulary(counter)) for counter in (faq_topic, faq_subtopic, issue_topic, issue_subtopic))
+                logger.info(f"Processing rows {wave[0][0]} to {wave[-1][0] + len(wave[-1][1])} of {len(misses)} uncached in {len(wave)} concurrent chunks")
+                responses = list(executor.map(lambda chunk: self.backend.classify_messages(chunk[1], *vocabulary), wave))
+
+                fresh = {}
+                for (_, rows), response in zip(wave, responses):
+                    self.update_vocabulary(response, faq_topic, faq_subtopic, issue_topic, issue_subtopic)
+                    chunk_results = results_by_index(response)
+                    # Tweets without any FAQ or issue are cached too, as empty results
+                    fresh.update({row['index']: chunk_results.get(row['index'], {"faq": [], "issue": []}) for row in rows})
+                results.update(fresh)
+                self.cache.put_many({keys[index]: result for index, result in fresh.items()})
+
+        faqs = [
+            {"index": row['index'], "tweetText": row['tweetText'], "topic": faq['topic'], "subtopic": faq['subtopic']}
+            for row in df_dict
+            for faq in results[row['index']]['faq']
+        ]
+        faqs_df = pd.DataFrame(faqs, columns=['index', 'tweetText', 'topic', 'subtopic'])
         logger.info(f"df.columns: {df.columns.tolist()}")
         logger.info(f"faqs_df.columns: {faqs_df.columns.tolist()}")
+        # The short positional index only lives in the prompt; rows are joined on the tweet id
+        faqs_df['tweet_id'] = faqs_df['index'].map(df.set_index('index')['tweet_id'])
         faqs_df = faqs_df.merge(
-            df[['index', 'tag', 'username', 'postTimeRaw', 'year', 'month', 'day']],
+            df[['tweet_id', 'tag', 'username', 'tweet_link', 'postTimeRaw', 'year', 'month', 'day']],
             how='left',
-            on='index'
+            on='tweet_id'
         )
 
         stop_word = list(
@@ -106,14 +113,11 @@ class WordCloud:
 
         faqs_df['topic'] = faqs_df['topic'].apply(lambda x: self.remove_stop_words_from_text(x, stop_word))
         faqs_df['subtopic'] = faqs_df['subtopic'].apply(lambda x: self.remove_stop_words_from_text(x, stop_word))
-        faqs_df = faqs_df.rename(columns={
-            "text": "tweetText"
-            })
         faqs_df.drop(columns=['index'], inplace=True)
         return faqs_df
 
 if __name__ == "__main__":
     word_cloud = WordCloud()
     faqs_df = word_cloud.classify()
-    load_lakefs = LakeFSLoader()
+    load_lakefs = get_loader()
     load_lakefs.load(faqs_df, lakefs_s3_path_ml, repo_name="tweets-repo-wordcloud")
\ No newline at end of file
@@ -1,49 +1,19 @@
 from fastapi import FastAPI
 from typing import List, Optional
-import os, json
-from dotenv import load_dotenv
-from google import genai
-from google.genai import types
-from src.backend.ml.config_ml import instruction, prompt_template
+from collections import Counter
+from src.backend.ml.backends import GeminiBackend
+from src.backend.ml.classify_cache import ClassificationCache, cache_key, results_by_index
+from src.backend.ml.batching import pack_batches, cap_vocabulary
 import uvicorn
 import pandas as pd
 from src.frontend.config_streamlit import random_color
 
-load_dotenv()
-
 app = FastAPI()
-client = genai.Client(api_key=os.getenv("GEMINI_API_KEY"))
+backend = GeminiBackend()
+cache = ClassificationCache()
 
-faq_topic, faq_subtopic = set(), set()
-issue_topic, issue_subtopic = set(), set()
-
-def classify_messages(
-    tweets_eles: list,
-    faq_topic: str = faq_topic,
-    faq_subtopic: str = faq_subtopic,
-    issue_topic: str = issue_topic,
-    issue_subtopic: str = issue_subtopic
-    ) -> dict:
-    prompt_formatted = prompt_template.format(
-        faq_topic = faq_topic,
-        faq_subtopic = faq_subtopic,
-        issue_topic = issue_topic,
-        issue_subtopic = issue_subtopic,
-        messages="\n".join([f"{row['index']}: {row['tweetText']}" for row in tweets_eles]),
-    )
-    response = client.models.generate_content(
-        model="gemini-2.0-flash",
-        contents=prompt_formatted,
-        config=types.GenerateContentConfig(
-            system_instruction=instruction,
-            temperature=0.2, # low temperature for more deterministic output kub
-        ),
-    )
-    response_text = response.text
-    response_json = response_text[response_text.index("{"): response_text.rindex("}") + 1]
-    response_json = response_json.replace("{{", "{").replace("}}", "}")
-    response_json = json.loads(response_json, strict=False)
-    return response_json
+faq_topic, faq_subtopic = Counter(), Counter()
+issue_topic, issue_subtopic = Counter(), Counter()
 
 def remove_stopwords(word_list, stopwords):
     return [word for word in word_list if word not in stopwords]
@@ -58,35 +28,33 @@ def classify(data_json: dict):
     df['index'] = df.index + 1
     df['postTimeRaw'] = df['postTimeRaw'].dt.strftime('%Y-%m-%d')
     df_dict:dict = df[['postTimeRaw', 'tweetText', 'index']].to_dict(orient='records')
-    step = 50
-    prev_stop = 0
-
-    all_response = []
+    # Only cache misses are sent to the LLM
+    keys = {row['index']: cache_key(row['tweetText'], model=backend.model) for row in df_dict}
+    cached = cache.get_many(list(keys.values()))
+    results = {index: cached[key] for index, key in keys.items() if key in cached}
+    misses = [row for row in df_dict if row['index'] not in results]
 
-    for ind in range(step, len(df_dict) + step, step):
-        start = prev_stop
-        stop = ind
-        prev_stop = stop
-        rows = df_dict[start:stop]
-        print(f"Processing rows {start} to {stop}")
+    # Prompts are packed up to a token budget and carry only the most frequent topics
+    for batch_number, rows in enumerate(pack_batches(misses), start=1):
+        print(f"Processing batch {batch_number} ({len(rows)} rows) of {len(misses)} uncached")
         
-        response = classify_messages(rows)
+        vocabulary = [", ".join(cap_vocabulary(counter)) for counter in (faq_topic, faq_subtopic, issue_topic, issue_subtopic)]
+        response = backend.classify_messages(rows, *vocabulary)
         
-        # Update the set with new issues and FAQs
+        # Update the counters with new issues and FAQs
         for row in response['issue']:
-            for topic in row['topic']:
-                issue_topic.add(topic)
-            for subtopic in row['subtopic']:
-                issue_subtopic.add(subtopic)
+            issue_topic.update(row['topic'])
+            issue_subtopic.update(row['subtopic'])
         for row in response['faq']:
-            for topic in row['topic']:
-                faq_topic.add(topic)
-            for subtopic in row['subtopic']:
-                faq_subtopic.add(subtopic)
+            faq_topic.update(row['topic'])
+            faq_subtopic.update(row['subtopic'])
         
-        all_response.append(response)
-    faqs = [faq for response in all_response for faq in response['faq']]
-    faqs_df = pd.DataFrame(faqs)
+        chunk_results = results_by_index(response)
+        fresh = {row['index']: chunk_results.get(row['index'], {"faq": [], "issue": []}) for row in rows}
+        results.update(fresh)
+        cache.put_many({keys[index]: result for index, result in fresh.items()})
+    faqs = [faq for row in df_dict for faq in results[row['index']]['faq']]
+    faqs_df = pd.DataFrame(faqs, columns=['topic', 'subtopic'])
     stop_word = list(
         set(
             word
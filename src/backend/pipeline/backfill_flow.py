@@ -0,0 +1,34 @@
+from prefect import flow, task
+# Import LakeFS loader
+from src.backend.load.lakefs_loader import get_loader
+# Import modern logging configuration
+from config.logging.modern_log import LoggingConfig
+
+
+logger = LoggingConfig(level="DEBUG", level_console="INFO").get_logger()
+
+@task(name="backfill rollup")
+def backfill_rollup(lakefs_endpoint: str) -> int:
+    return get_loader(host=lakefs_endpoint).backfill_rollup(lakefs_endpoint=lakefs_endpoint)
+
+@task(name="backfill subtopic counts")
+def backfill_subtopic_counts(lakefs_endpoint: str) -> int:
+    return get_loader(host=lakefs_endpoint).backfill_subtopic_counts(lakefs_endpoint=lakefs_endpoint)
+
+@task(name="backfill subtopic index")
+def backfill_subtopic_index(lakefs_endpoint: str) -> int:
+    return get_loader(host=lakefs_endpoint).backfill_subtopic_index(lakefs_endpoint=lakefs_endpoint)
+
+@flow(name="Backfill Flow", log_prints=True)
+def backfill_flow():
+    # One-off: derived datasets written by the incremental flow only cover days loaded after they were introduced
+    lakefs_endpoint = "http://lakefsdb:8000"
+    partitions = backfill_rollup(lakefs_endpoint=lakefs_endpoint)
+    print(f"Rollup rebuilt from {partitions} tweet partitions")
+    partitions = backfill_subtopic_counts(lakefs_endpoint=lakefs_endpoint)
+    print(f"Subtopic counts rebuilt from {partitions} word cloud partitions")
+    partitions = backfill_subtopic_index(lakefs_endpoint=lakefs_endpoint)
+    print(f"Subtopic index rebuilt from {partitions} word cloud partitions")
+
+if __name__ == "__main__":
+    backfill_flow()
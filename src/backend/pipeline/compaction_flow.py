@@ -0,0 +1,43 @@
+from prefect import flow, task
+from prefect.schedules import Interval
+from pathlib import Path
+from datetime import timedelta
+# Import LakeFS loader
+from src.backend.load.lakefs_loader import get_loader
+# Import modern logging configuration
+from config.logging.modern_log import LoggingConfig
+# Import path configuration
+from config.path_config import lakefs_s3_path, lakefs_s3_path_ml
+
+
+logger = LoggingConfig(level="DEBUG", level_console="INFO").get_logger()
+
+@task(name="compact dataset")
+def compact_dataset(lakefs_endpoint: str, lakefs_s3_path: str, min_files: int, row_group_size: int) -> dict:
+    return get_loader(host=lakefs_endpoint).compact_partitions(
+        lakefs_endpoint=lakefs_endpoint,
+        lakefs_s3_path=lakefs_s3_path,
+        min_files=min_files,
+        row_group_size=row_group_size,
+    )
+
+@flow(name="Compaction Flow", log_prints=True)
+def compaction_flow(min_files: int = 4, row_group_size: int = 128_000):
+    lakefs_endpoint = "http://lakefsdb:8000"
+    for dataset_path in (lakefs_s3_path, lakefs_s3_path_ml):
+        summary = compact_dataset(lakefs_endpoint=lakefs_endpoint, lakefs_s3_path=dataset_path, min_files=min_files, row_group_size=row_group_size)
+        print(f"Compaction of {dataset_path}: {summary}")
+
+if __name__ == "__main__":
+    # compaction_flow()
+    compaction_flow.from_source(
+        source=Path(__file__).parent,
+        entrypoint="./compaction_flow.py:compaction_flow",
+    ).deploy(
+        name="compact-tweets-daily",
+        work_pool_name="x-worker",
+        schedule=Interval(
+            timedelta(days=1),
+            timezone="Asia/Bangkok"
+        )
+    )
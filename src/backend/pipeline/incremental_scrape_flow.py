@@ -1,13 +1,22 @@
 from prefect import flow, task
+from prefect.cache_policies import NO_CACHE
 from prefect.schedules import Interval
 from pathlib import Path
 import pandas as pd
-from datetime import timedelta
+from datetime import datetime, timedelta
 import asyncio
 # Import XScraping for scraping
 from src.backend.scraping.x_scraping import XScraping
+# Import shared browser pool
+from src.backend.scraping.browser_pool import BrowserPool
+# Import adaptive request pacing
+from src.backend.scraping.pacing import AdaptivePacer
+# Import tag scheduler
+from src.backend.pipeline.scheduler import TagScheduler
+# Import scrape state store
+from src.backend.scraping.state_store import ScrapeStateStore
 # Import LakeFS loader
-from src.backend.load.lakefs_loader import LakeFSLoader
+from src.backend.load.lakefs_loader import get_loader
 # Import validation configuration
 from src.backend.validation.validate import ValidationPydantic, TweetData
 # Import modern logging configuration
@@ -22,11 +31,16 @@ logger = LoggingConfig(level="DEBUG", level_console="INFO").get_logger()
 
 @task(name="generate word cloud")
 def generate_wordcloud(df: pd.DataFrame) -> pd.DataFrame:
-    return WordCloud().classify(df=df)
+    # classify() cleans and dedups tweet text in place; the raw rows are still loaded afterwards
+    return WordCloud().classify(df=df.copy())
+
+@task(name="filter new rows")
+def filter_new_rows(data: pd.DataFrame, lakefs_endpoint: str) -> pd.DataFrame:
+    return get_loader(host=lakefs_endpoint).filter_new(data=data, lakefs_endpoint=lakefs_endpoint)
 
 @task(name="load word cloud to lakefs")
-def load_wordcloud_to_lakefs(faqs_df: pd.DataFrame, lakefs_endpoint: str, lakefs_s3_path: str) -> None:
-    return LakeFSLoader(host=lakefs_endpoint).incremental_load(faqs_df, lakefs_endpoint=lakefs_endpoint, lakefs_s3_path=lakefs_s3_path, is_wordcloud=True)
+def load_wordcloud_to_lakefs(faqs_df: pd.DataFrame, lakefs_endpoint: str, lakefs_s3_path: str) -> pd.DataFrame:
+    return get_loader(host=lakefs_endpoint).incremental_load(faqs_df, lakefs_endpoint=lakefs_endpoint, lakefs_s3_path=lakefs_s3_path)
 
 @task(name="encode tags")
 def encode_tags(tags: dict[str, list[str]]) -> dict[str, dict[str, str]]:
@@ -46,26 +60,46 @@ def validate_dataframe(data: pd.DataFrame) -> bool:
     return validator.validate(df=data, scrape_new=True)
 
 @task(name="load to lakefs")
-def load_to_lakefs(data: pd.DataFrame, lakefs_endpoint: str = None) -> None:
-    LakeFSLoader(host=lakefs_endpoint).incremental_load(data=data, lakefs_endpoint=lakefs_endpoint)
-
-@task(name="scrape tag")
-async def scrape_tag(category: str, tag: str, tag_url: str, max_scrolls: int) -> list[dict]:
-    return await XScraping().scrape_all_tweet_texts(category=category, tag=tag, tag_url=tag_url, max_scrolls=max_scrolls)
+def load_to_lakefs(data: pd.DataFrame, lakefs_endpoint: str = None) -> pd.DataFrame:
+    return get_loader(host=lakefs_endpoint).incremental_load(data=data, lakefs_endpoint=lakefs_endpoint)
+
+@task(name="scrape tag", cache_policy=NO_CACHE)
+async def scrape_tag(category: str, tag: str, tag_url: str, max_scrolls: int, browser_pool: BrowserPool, pacer: AdaptivePacer, state_store: ScrapeStateStore, extract_mode: str = "dom", since: datetime | None = None) -> list[dict]:
+    return await XScraping(browser_pool=browser_pool, extract_mode=extract_mode, pacer=pacer, state_store=state_store).scrape_all_tweet_texts(category=category, tag=tag, tag_url=tag_url, max_scrolls=max_scrolls, since=since)
+
+@task(name="get high-water marks", cache_policy=NO_CACHE)
+def get_high_water_marks(tags: list[str], state_store: ScrapeStateStore, lakefs_endpoint: str) -> dict[str, datetime]:
+    # The state store is updated after every run; the rollup only fills in tags it has never seen
+    marks = state_store.high_water_marks()
+    if any(tag not in marks for tag in tags):
+        rollup_marks = get_loader(host=lakefs_endpoint).high_water_marks(lakefs_endpoint=lakefs_endpoint)
+        marks.update({tag: mark for tag, mark in rollup_marks.items() if tag in tags and tag not in marks})
+    return marks
+
+@task(name="record scraped tweets", cache_policy=NO_CACHE)
+def record_scraped_tweets(data: pd.DataFrame, state_store: ScrapeStateStore) -> None:
+    state_store.record_tweets(data)
 
 @task(name="check hash", log_prints=True)
 def check_hash_task(df: pd.DataFrame, lakefs_endpoint: str) -> bool:
-    return LakeFSLoader(host=lakefs_endpoint).check_hash(df=df, lakefs_endpoint=lakefs_endpoint)
+    return get_loader(host=lakefs_endpoint).check_hash(df=df, lakefs_endpoint=lakefs_endpoint)
 
 async def scrape_flow():
     tag_urls = encode_tags(tags)
-    semaphore = asyncio.Semaphore(3)
-    delay_seconds = 30
+    browser_pool = BrowserPool(num_browsers=1, pages_per_browser=3, max_page_uses=10)
+    state_store = ScrapeStateStore()
+    scheduler = TagScheduler(concurrency=browser_pool.size, state_store=state_store)
+    # Network capture stays opt-in until the parser is checked against a captured SearchTimeline response
+    extract_mode = "dom"
+    pacer = AdaptivePacer(rate=0.1, max_rate=0.5)
     lakefs_endpoint = "http://lakefsdb:8000"
+    # Scroll until the stored high-water mark is reached, capped for tags with no history
+    max_scrolls = 20
+    high_water_marks = get_high_water_marks(tags=[tag for tag_url_dict in tag_urls.values() for tag in tag_url_dict], state_store=state_store, lakefs_endpoint=lakefs_endpoint)
 
-    async def scrape_with_limit(category: str, tag: str, url: str):
-        async with semaphore:
-            return await scrape_tag(category=category, tag=tag, tag_url=url, max_scrolls=1)
+    async def scrape_one(category: str, tag: str, url: str):
+        since = high_water_marks.get(tag)
+        return await scrape_tag(category=category, tag=tag, tag_url=url, max_scrolls=max_scrolls if since else 1, browser_pool=browser_pool, pacer=pacer, state_store=state_store, extract_mode=extract_mode, since=since)
         
     task_list = [
         (category, tag, url)
@@ -73,31 +107,33 @@ async def scrape_flow():
         for tag, url in tag_url_dict.items()
     ]
 
-    all_results = []
-
-    for i in range(0, len(task_list), 3):
-        batch = task_list[i:i+3]
-        futures = [
-            scrape_with_limit(category, tag, url)
-            for category, tag, url in batch
-        ]
-        results = await asyncio.gather(*futures)
-        all_results.extend(results)
-
-        if i + 3 < len(task_list):
-            print(f"Completed batch {i//3 + 1}. Sleeping for {delay_seconds} seconds...")
-            await asyncio.sleep(delay_seconds)
+    async with browser_pool:
+        all_results = await scheduler.run(task_list, scrape_one)
 
+    print(f"Scraping finished. Pacer stats: {pacer.stats()}")
     all_tweets = flatten_results(all_results)
+    if not all_tweets:
+        print("No new tweets scraped.")
+        return
     data = to_dataframe(all_tweets)
     check_hash_status = check_hash_task(df=data, lakefs_endpoint=lakefs_endpoint)
     if check_hash_status:
         print(f"Changes detected. Hash not matched.")
         is_valid = validate_dataframe(data=data)
         if is_valid:
-            faqs_df = generate_wordcloud(df=data)
-            load_to_lakefs(data=data, lakefs_endpoint=lakefs_endpoint)
+            # Only tweets not stored yet are classified; with short scrolls most of a batch repeats
+            new_rows = filter_new_rows(data=data, lakefs_endpoint=lakefs_endpoint)
+            if new_rows.empty:
+                print("All scraped tweets are already stored.")
+                record_scraped_tweets(data=data, state_store=state_store)
+                return
+            faqs_df = generate_wordcloud(df=new_rows)
+            # The word cloud is committed before the raw tweets: if it fails, the tweets still count as new next run
+            # and are classified again (mostly from the cache); its own dedup shards skip anything already loaded
             load_wordcloud_to_lakefs(faqs_df=faqs_df, lakefs_endpoint=lakefs_endpoint, lakefs_s3_path=lakefs_s3_path_ml)
+            load_to_lakefs(data=new_rows, lakefs_endpoint=lakefs_endpoint)
+            # Scrape state only moves on once everything is loaded
+            record_scraped_tweets(data=data, state_store=state_store)
         else:
             print("Validation failed, data not saved.")
     else:
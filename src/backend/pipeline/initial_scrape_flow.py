@@ -1,4 +1,5 @@
 from prefect import flow, task
+from prefect.cache_policies import NO_CACHE
 import pandas as pd
 import os
 import asyncio
@@ -7,8 +8,16 @@ import asyncio
 
 # Import XScraping for scraping
 from src.backend.scraping.x_scraping import XScraping
+# Import shared browser pool
+from src.backend.scraping.browser_pool import BrowserPool
+# Import adaptive request pacing
+from src.backend.scraping.pacing import AdaptivePacer
+# Import tag scheduler
+from src.backend.pipeline.scheduler import TagScheduler
+# Import scrape state store
+from src.backend.scraping.state_store import ScrapeStateStore
 # Import LakeFS loader
-from src.backend.load.lakefs_loader import LakeFSLoader
+from src.backend.load.lakefs_loader import get_loader
 # Import validation configuration
 from src.backend.validation.validate import ValidationPydantic, TweetData
 # Import modern logging configuration
@@ -22,11 +31,12 @@ logger = LoggingConfig(level="DEBUG", level_console="DEBUG").get_logger()
 
 @task(name="generate word cloud")
 def generate_wordcloud(df: pd.DataFrame) -> pd.DataFrame:
-    return WordCloud().classify(df=df)
+    # classify() cleans and dedups tweet text in place; the raw rows are still loaded afterwards
+    return WordCloud().classify(df=df.copy())
 
 @task(name="load word cloud to lakefs")
 def load_wordcloud_to_lakefs(faqs_df: pd.DataFrame, lakefs_endpoint: str, lakefs_s3_path: str) -> None:
-    return LakeFSLoader(host=lakefs_endpoint).load(faqs_df, lakefs_endpoint=lakefs_endpoint, repo_name=repo_name_ml,lakefs_s3_path=lakefs_s3_path)
+    return get_loader(host=lakefs_endpoint).load(faqs_df, lakefs_endpoint=lakefs_endpoint, repo_name=repo_name_ml,lakefs_s3_path=lakefs_s3_path)
 
 @task(name="encode tags")
 def encode_tags(tags: dict[str, list[str]]) -> dict[str, dict[str, str]]:
@@ -53,31 +63,38 @@ def save_to_csv(data: pd.DataFrame, path: str = "/root/flows/data/from_prefect/t
 
 @task(name="load to lakefs")
 def load_to_lakefs(data: pd.DataFrame, lakefs_endpoint: str = None) -> None:
-    LakeFSLoader(host=lakefs_endpoint).load(data=data, lakefs_endpoint=lakefs_endpoint)
+    get_loader(host=lakefs_endpoint).load(data=data, lakefs_endpoint=lakefs_endpoint)
 
-@task(name="scrape tag")
-async def scrape_tag(category: str, tag: str, tag_url: str) -> list[dict]:
+@task(name="scrape tag", cache_policy=NO_CACHE)
+async def scrape_tag(category: str, tag: str, tag_url: str, browser_pool: BrowserPool, pacer: AdaptivePacer, state_store: ScrapeStateStore, extract_mode: str = "dom") -> list[dict]:
     try:
-        return await XScraping().scrape_all_tweet_texts(category=category, tag=tag, tag_url=tag_url, max_scrolls=20)
+        return await XScraping(browser_pool=browser_pool, extract_mode=extract_mode, pacer=pacer, state_store=state_store).scrape_all_tweet_texts(category=category, tag=tag, tag_url=tag_url, max_scrolls=20)
     except Exception as e:
         logger.error(f"[ERROR] Tag '{tag}' failed: {str(e)}")
         raise
 
+@task(name="record scraped tweets", cache_policy=NO_CACHE)
+def record_scraped_tweets(data: pd.DataFrame, state_store: ScrapeStateStore) -> None:
+    state_store.record_tweets(data)
+
 @task(name="upload hash")
 def unload_hash(df: pd.DataFrame, lakefs_endpoint: str) -> bool:
-    return LakeFSLoader(host=lakefs_endpoint).load_hash(df=df, lakefs_endpoint=lakefs_endpoint)
+    return get_loader(host=lakefs_endpoint).load_hash(df=df, lakefs_endpoint=lakefs_endpoint)
 
 
 @flow(name="Initial Scrape Flow")
 async def scrape_flow():
     tag_urls = encode_tags(tags)
-    semaphore = asyncio.Semaphore(3)
-    delay_seconds = 30
+    browser_pool = BrowserPool(num_browsers=1, pages_per_browser=3, max_page_uses=10)
+    state_store = ScrapeStateStore()
+    scheduler = TagScheduler(concurrency=browser_pool.size, state_store=state_store)
+    # Network capture stays opt-in until the parser is checked against a captured SearchTimeline response
+    extract_mode = "dom"
+    pacer = AdaptivePacer(rate=0.05, max_rate=0.3)
     lakefs_endpoint = "http://lakefsdb:8000"
 
-    async def scrape_with_limit(category: str, tag: str, url: str):
-        async with semaphore:
-            return await scrape_tag(category=category, tag=tag, tag_url=url)
+    async def scrape_one(category: str, tag: str, url: str):
+        return await scrape_tag(category=category, tag=tag, tag_url=url, browser_pool=browser_pool, pacer=pacer, state_store=state_store, extract_mode=extract_mode)
         
     task_list = [
         (category, tag, url)
@@ -85,22 +102,14 @@ async def scrape_flow():
         for tag, url in tag_url_dict.items()
     ]
 
-    all_results = []
-
-    for i in range(0, len(task_list), 3):
-        batch = task_list[i:i+3]
-        futures = [
-            scrape_with_limit(category, tag, url)
-            for category, tag, url in batch
-        ]
-        results = await asyncio.gather(*futures)
-        all_results.extend(results)
-
-        if i + 3 < len(task_list):
-            logger.info(f"Completed batch {i//3 + 1}. Sleeping for {delay_seconds} seconds...")
-            await asyncio.sleep(delay_seconds)
+    async with browser_pool:
+        all_results = await scheduler.run(task_list, scrape_one)
 
+    logger.info(f"Scraping finished. Pacer stats: {pacer.stats()}")
     all_tweets = flatten_results(all_results)
+    if not all_tweets:
+        logger.info("No new tweets scraped.")
+        return
     data = to_dataframe(all_tweets)
     logger.info(f"Total tweets scraped: {len(data)}")
 
@@ -112,8 +121,10 @@ async def scrape_flow():
         # load_to_lakefs(data=data, lakefs_endpoint=lakefs_endpoint)
         save_to_csv(data)
         unload_hash(df=data, lakefs_endpoint=lakefs_endpoint)
-        load_to_lakefs(data=data, lakefs_endpoint=lakefs_endpoint)
+        # Word cloud first and scrape state last, as in the incremental flow
         load_wordcloud_to_lakefs(faqs_df=faqs_df, lakefs_endpoint=lakefs_endpoint, lakefs_s3_path=lakefs_s3_path_ml)
+        load_to_lakefs(data=data, lakefs_endpoint=lakefs_endpoint)
+        record_scraped_tweets(data=data, state_store=state_store)
     else:
         logger.warning("Validation failed, data not saved.")
 
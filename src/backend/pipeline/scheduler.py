@@ -0,0 +1,55 @@
+import asyncio
+import math
+import time
+from typing import Awaitable, Callable
+
+# Import modern logging configuration
+from config.logging.modern_log import LoggingConfig
+# Import scrape state store
+from src.backend.scraping.state_store import ScrapeStateStore
+
+logger = LoggingConfig(level="DEBUG", level_console="INFO").get_logger()
+
+class TagScheduler:
+    # Keeps `concurrency` slots busy: every slot pulls the next tag from one shared queue
+    # as soon as it finishes, instead of waiting on a fixed batch barrier.
+    def __init__(self, concurrency: int = 3, state_store: ScrapeStateStore | None = None):
+        self.concurrency = concurrency
+        self.state_store = state_store or ScrapeStateStore()
+
+    def priority(self, stats: dict | None, now: float) -> float:
+        if not stats or stats["last_scraped"] is None:
+            return math.inf
+        hours_since_scrape = max(now - stats["last_scraped"], 0) / 3600
+        return (1 + stats["avg_yield"]) * hours_since_scrape
+
+    def order(self, jobs: list[tuple[str, str, str]]) -> list[tuple[str, str, str]]:
+        now = time.time()
+        tag_states = self.state_store.tag_states()
+        return sorted(jobs, key=lambda job: self.priority(tag_states.get(job[1]), now), reverse=True)
+
+    async def run(self, jobs: list[tuple[str, str, str]], worker: Callable[[str, str, str], Awaitable[list[dict]]]) -> list[list[dict]]:
+        queue = asyncio.Queue()
+        for job in self.order(jobs):
+            queue.put_nowait(job)
+        results = []
+
+        async def slot(slot_id: int) -> None:
+            while True:
+                try:
+                    category, tag, url = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+                start = time.monotonic()
+                try:
+                    result = await worker(category, tag, url)
+                except Exception as e:
+                    logger.error(f"Slot {slot_id}: tag '{tag}' failed, moving on to the next tag: {str(e)}")
+                    continue
+                results.append(result)
+                self.state_store.record_scrape(tag, len(result))
+                logger.info(f"Slot {slot_id} finished {tag} in {time.monotonic() - start:.1f}s ({len(result)} tweets, {queue.qsize()} tags left)")
+
+        logger.info(f"Scheduling {len(jobs)} tags on {self.concurrency} slots")
+        await asyncio.gather(*(slot(i + 1) for i in range(self.concurrency)))
+        return results
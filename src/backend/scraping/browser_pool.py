@@ -0,0 +1,139 @@
+import asyncio
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from playwright.async_api import async_playwright, Browser, BrowserContext, Page
+
+# Import modern logging configuration
+from config.logging.modern_log import LoggingConfig
+# Import path configuration
+from config.path_config import AUTH_TWITTER
+
+logger = LoggingConfig(level="DEBUG", level_console="INFO").get_logger()
+
+@dataclass
+class PageSlot:
+    browser_index: int
+    page: Page | None = None
+    uses: int = 0
+    healthy: bool = True
+
+class BrowserPool:
+    def __init__(
+        self,
+        num_browsers: int = 1,
+        pages_per_browser: int = 3,
+        max_page_uses: int = 10,
+        headless: bool = True,
+        storage_state: str = AUTH_TWITTER,
+        viewport: dict | None = None,
+    ):
+        self.num_browsers = num_browsers
+        self.pages_per_browser = pages_per_browser
+        self.max_page_uses = max_page_uses
+        self.headless = headless
+        self.storage_state = storage_state
+        self.viewport = viewport or {"width": 1280, "height": 1024}
+
+        self._playwright = None
+        self._browsers: list[Browser | None] = [None] * num_browsers
+        self._contexts: list[BrowserContext | None] = [None] * num_browsers
+        self._slots: asyncio.Queue[PageSlot] | None = None
+        self._lock = asyncio.Lock()
+
+    @property
+    def size(self) -> int:
+        return self.num_browsers * self.pages_per_browser
+
+    async def start(self) -> "BrowserPool":
+        if self._playwright is not None:
+            return self
+        self._playwright = await async_playwright().start()
+        self._slots = asyncio.Queue()
+        for browser_index in range(self.num_browsers):
+            await self._launch(browser_index)
+            for _ in range(self.pages_per_browser):
+                self._slots.put_nowait(PageSlot(browser_index=browser_index))
+        logger.info(f"Browser pool started: {self.num_browsers} browser(s) x {self.pages_per_browser} page(s)")
+        return self
+
+    async def close(self) -> None:
+        if self._playwright is None:
+            return
+        for browser in self._browsers:
+            if browser is not None and browser.is_connected():
+                await browser.close()
+        await self._playwright.stop()
+        self._playwright = None
+        self._browsers = [None] * self.num_browsers
+        self._contexts = [None] * self.num_browsers
+        self._slots = None
+        logger.info("Browser pool closed")
+
+    async def __aenter__(self) -> "BrowserPool":
+        return await self.start()
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.close()
+
+    async def _launch(self, browser_index: int) -> None:
+        browser = await self._playwright.chromium.launch(headless=self.headless)
+        context = await browser.new_context(
+            storage_state=self.storage_state,
+            viewport=self.viewport,
+        )
+        self._browsers[browser_index] = browser
+        self._contexts[browser_index] = context
+        logger.debug(f"Launched browser {browser_index + 1}/{self.num_browsers}")
+
+    async def _is_healthy(self, slot: PageSlot) -> bool:
+        browser = self._browsers[slot.browser_index]
+        if browser is None or not browser.is_connected():
+            return False
+        if slot.page is None or slot.page.is_closed() or not slot.healthy:
+            return False
+        try:
+            await asyncio.wait_for(slot.page.evaluate("1"), timeout=5)
+        except Exception:
+            return False
+        return True
+
+    async def _recycle(self, slot: PageSlot) -> None:
+        if slot.page is not None and not slot.page.is_closed():
+            try:
+                await slot.page.close()
+            except Exception as e:
+                logger.debug(f"Ignoring error while closing page: {e}")
+
+        async with self._lock:
+            browser = self._browsers[slot.browser_index]
+            if browser is None or not browser.is_connected():
+                logger.warning(f"Browser {slot.browser_index + 1} disconnected, relaunching...")
+                await self._launch(slot.browser_index)
+
+        slot.page = await self._contexts[slot.browser_index].new_page()
+        slot.uses = 0
+        slot.healthy = True
+
+    @asynccontextmanager
+    async def page(self):
+        if self._playwright is None:
+            await self.start()
+
+        slot = await self._slots.get()
+        try:
+            if slot.uses >= self.max_page_uses or not await self._is_healthy(slot):
+                await self._recycle(slot)
+            try:
+                yield slot.page
+            except Exception:
+                slot.healthy = False
+                raise
+            finally:
+                slot.uses += 1
+                if slot.healthy and not slot.page.is_closed():
+                    try:
+                        await slot.page.goto("about:blank")
+                    except Exception:
+                        slot.healthy = False
+        finally:
+            self._slots.put_nowait(slot)
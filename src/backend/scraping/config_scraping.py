@@ -0,0 +1,28 @@
+# In-page extraction of every loaded article in a single page.evaluate call.
+# Mirrors XScraping.extract_articles, including the username span-index heuristic
+# (4 spans -> index 2, otherwise index 3).
+extract_articles_script = """
+() => Array.from(document.querySelectorAll("article")).map((article) => {
+    const displayName = article.querySelector("[data-testid='User-Name']");
+    if (!displayName) {
+        return null;
+    }
+    const linkElements = displayName.querySelectorAll("a");
+    if (linkElements.length <= 2) {
+        return null;
+    }
+    const spans = displayName.querySelectorAll("span");
+    const timeTag = displayName.querySelector("time");
+    const tweetTextTag = article.querySelector("[data-testid='tweetText']");
+    if (spans.length <= 3 || !timeTag || !tweetTextTag) {
+        return null;
+    }
+    const userName = spans.length === 4 ? spans[2].textContent : spans[3].textContent;
+    return {
+        username: (userName || "").trim(),
+        text: (tweetTextTag.textContent || "").trim(),
+        datetime: timeTag.getAttribute("datetime"),
+        link: linkElements[2].getAttribute("href"),
+    };
+}).filter((record) => record !== null)
+"""
@@ -0,0 +1,81 @@
+import asyncio
+import random
+import time
+from collections import deque
+
+# Import modern logging configuration
+from config.logging.modern_log import LoggingConfig
+
+logger = LoggingConfig(level="DEBUG", level_console="INFO").get_logger()
+
+class AdaptivePacer:
+    # Token bucket whose refill rate (requests/second) follows AIMD:
+    # additive increase while pages keep loading, multiplicative decrease on failure.
+    def __init__(
+        self,
+        rate: float = 0.1,
+        min_rate: float = 1 / 60,
+        max_rate: float = 0.5,
+        burst: float = 1.0,
+        increase: float = 0.01,
+        decrease_factor: float = 0.5,
+        jitter: float = 0.25,
+        window_seconds: float = 300.0,
+    ):
+        self.rate = rate
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.burst = burst
+        self.increase = increase
+        self.decrease_factor = decrease_factor
+        self.jitter = jitter
+        self.window_seconds = window_seconds
+
+        self._tokens = burst
+        self._last_refill = time.monotonic()
+        self._requests: deque[float] = deque()
+        self._lock = asyncio.Lock()
+        self.successes = 0
+        self.failures = 0
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.burst, self._tokens + (now - self._last_refill) * self.rate)
+        self._last_refill = now
+
+    async def acquire(self) -> float:
+        async with self._lock:
+            self._refill(time.monotonic())
+            wait = 0.0
+            if self._tokens < 1:
+                wait = (1 - self._tokens) / self.rate * random.uniform(1 - self.jitter, 1 + self.jitter)
+                await asyncio.sleep(wait)
+                self._refill(time.monotonic())
+            self._tokens = max(0.0, self._tokens - 1)
+            self._requests.append(time.monotonic())
+            return wait
+
+    def on_success(self) -> None:
+        self.successes += 1
+        self.rate = min(self.max_rate, self.rate + self.increase)
+
+    def on_failure(self) -> None:
+        self.failures += 1
+        self.rate = max(self.min_rate, self.rate * self.decrease_factor)
+        logger.warning(f"Backing off: request rate lowered to {self.rate:.3f} req/s")
+
+    @property
+    def observed_rate(self) -> float:
+        now = time.monotonic()
+        while self._requests and now - self._requests[0] > self.window_seconds:
+            self._requests.popleft()
+        if len(self._requests) < 2:
+            return 0.0
+        return (len(self._requests) - 1) / max(now - self._requests[0], 1e-9)
+
+    def stats(self) -> dict:
+        return {
+            "rate": self.rate,
+            "observed_rate": self.observed_rate,
+            "successes": self.successes,
+            "failures": self.failures,
+        }
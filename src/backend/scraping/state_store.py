@@ -0,0 +1,113 @@
+import os
+import sqlite3
+import time
+from contextlib import closing
+from datetime import datetime
+import pandas as pd
+
+# Import modern logging configuration
+from config.logging.modern_log import LoggingConfig
+# Import path configuration
+from config.path_config import SCRAPE_STATE
+# Import tweet id parsing
+from config.tweet_id import tweet_ids
+
+logger = LoggingConfig(level="DEBUG", level_console="INFO").get_logger()
+
+class ScrapeStateStore:
+    def __init__(self, path: str = SCRAPE_STATE, max_recent_keys: int = 5000):
+        self.path = path
+        self.max_recent_keys = max_recent_keys
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with closing(self._connect()) as conn, conn:
+            conn.executescript("""
+                CREATE TABLE IF NOT EXISTS tag_state (
+                    tag TEXT PRIMARY KEY,
+                    high_water TEXT,
+                    last_tweet_id TEXT,
+                    last_scraped REAL,
+                    last_yield INTEGER,
+                    avg_yield REAL
+                );
+                CREATE TABLE IF NOT EXISTS recent_keys (
+                    tag TEXT NOT NULL,
+                    key TEXT NOT NULL,
+                    seen_at REAL NOT NULL,
+                    PRIMARY KEY (tag, key)
+                );
+                CREATE INDEX IF NOT EXISTS idx_recent_keys_seen_at ON recent_keys (tag, seen_at);
+            """)
+
+    def _connect(self) -> sqlite3.Connection:
+        # One short-lived connection per call keeps the store safe to use from Prefect task threads
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def tag_states(self) -> dict[str, dict]:
+        with closing(self._connect()) as conn:
+            rows = conn.execute("SELECT * FROM tag_state").fetchall()
+        return {row["tag"]: dict(row) for row in rows}
+
+    def tag_state(self, tag: str) -> dict | None:
+        with closing(self._connect()) as conn:
+            row = conn.execute("SELECT * FROM tag_state WHERE tag = ?", (tag,)).fetchone()
+        return dict(row) if row else None
+
+    def high_water_marks(self) -> dict[str, datetime]:
+        return {tag: datetime.fromisoformat(state["high_water"]) for tag, state in self.tag_states().items() if state["high_water"]}
+
+    def recent_keys(self, tag: str) -> set[str]:
+        with closing(self._connect()) as conn:
+            rows = conn.execute("SELECT key FROM recent_keys WHERE tag = ?", (tag,)).fetchall()
+        return {row["key"] for row in rows}
+
+    def record_scrape(self, tag: str, n_tweets: int, yield_smoothing: float = 0.5) -> None:
+        state = self.tag_state(tag)
+        avg_yield = n_tweets
+        if state and state["avg_yield"] is not None:
+            avg_yield = yield_smoothing * n_tweets + (1 - yield_smoothing) * state["avg_yield"]
+        with closing(self._connect()) as conn, conn:
+            conn.execute("""
+                INSERT INTO tag_state (tag, last_scraped, last_yield, avg_yield) VALUES (?, ?, ?, ?)
+                ON CONFLICT (tag) DO UPDATE SET
+                    last_scraped = excluded.last_scraped,
+                    last_yield = excluded.last_yield,
+                    avg_yield = excluded.avg_yield
+            """, (tag, time.time(), n_tweets, avg_yield))
+
+    def record_tweets(self, data: pd.DataFrame) -> None:
+        if data.empty:
+            return
+        now = time.time()
+        with closing(self._connect()) as conn, conn:
+            for tag, group in data.groupby("tag", observed=True):
+                tag = str(tag)
+                # Keys are status ids as strings, the same ids the scraper puts in seen_pairs
+                ids = group["tweet_id"] if "tweet_id" in group.columns else tweet_ids(group["tweet_link"])
+                group = group.assign(key=ids).dropna(subset=["key"])
+                if group.empty:
+                    continue
+                group["key"] = group["key"].astype("int64").astype(str)
+                conn.executemany(
+                    "INSERT OR REPLACE INTO recent_keys (tag, key, seen_at) VALUES (?, ?, ?)",
+                    [(tag, key, now) for key in group["key"]],
+                )
+                conn.execute("""
+                    DELETE FROM recent_keys WHERE tag = ? AND key NOT IN (
+                        SELECT key FROM recent_keys WHERE tag = ? ORDER BY seen_at DESC LIMIT ?
+                    )
+                """, (tag, tag, self.max_recent_keys))
+
+                latest = group.loc[group["postTimeRaw"].idxmax()]
+                high_water = pd.Timestamp(latest["postTimeRaw"]).to_pydatetime()
+                row = conn.execute("SELECT high_water FROM tag_state WHERE tag = ?", (tag,)).fetchone()
+                if row and row["high_water"] and datetime.fromisoformat(row["high_water"]) >= high_water:
+                    continue
+                conn.execute("""
+                    INSERT INTO tag_state (tag, high_water, last_tweet_id) VALUES (?, ?, ?)
+                    ON CONFLICT (tag) DO UPDATE SET
+                        high_water = excluded.high_water,
+                        last_tweet_id = excluded.last_tweet_id
+                """, (tag, high_water.isoformat(), latest["key"]))
+        logger.info(f"Recorded {len(data)} tweets in scrape state store {self.path}")
@@ -0,0 +1,88 @@
+import html
+from datetime import datetime
+from typing import Iterator
+
+# Import modern logging configuration
+from config.logging.modern_log import LoggingConfig
+
+logger = LoggingConfig(level="DEBUG", level_console="INFO").get_logger()
+
+SEARCH_TIMELINE_OPERATION = "SearchTimeline"
+
+def is_search_timeline_response(url: str) -> bool:
+    return f"/{SEARCH_TIMELINE_OPERATION}" in url
+
+def iter_tweet_results(payload: dict) -> Iterator[dict]:
+    instructions = (
+        payload.get("data", {})
+        .get("search_by_raw_query", {})
+        .get("search_timeline", {})
+        .get("timeline", {})
+        .get("instructions", [])
+    )
+    for instruction in instructions:
+        entries = instruction.get("entries") or ([instruction["entry"]] if "entry" in instruction else [])
+        for entry in entries:
+            if entry.get("entryId", "").startswith("promoted"):
+                continue
+            content = entry.get("content", {})
+            item_contents = [content.get("itemContent")]
+            item_contents += [item.get("item", {}).get("itemContent") for item in content.get("items", [])]
+            for item_content in item_contents:
+                # Cursor entries carry no itemContent; promoted tweets can also sit under a plain tweet-* entry id
+                if not item_content or item_content.get("itemType") != "TimelineTweet" or item_content.get("promotedMetadata"):
+                    continue
+                result = item_content.get("tweet_results", {}).get("result")
+                if result and result.get("__typename") == "TweetWithVisibilityResults":
+                    result = result.get("tweet")
+                # Deleted or withheld tweets come back as TweetTombstone / TweetUnavailable
+                if result and result.get("__typename", "Tweet") == "Tweet":
+                    yield result
+
+def tweet_result_id(result: dict) -> str | None:
+    return result.get("rest_id") or (result.get("legacy") or {}).get("id_str")
+
+def parse_tweet_result(result: dict, category: str, tag: str, scrape_time: str) -> dict | None:
+    legacy = result.get("legacy") or {}
+    user = result.get("core", {}).get("user_results", {}).get("result", {})
+    screen_name = user.get("core", {}).get("screen_name") or user.get("legacy", {}).get("screen_name")
+    tweet_id = tweet_result_id(result)
+    created_at = legacy.get("created_at")
+
+    tweet_text = result.get("note_tweet", {}).get("note_tweet_results", {}).get("result", {}).get("text")
+    if not tweet_text:
+        tweet_text = legacy.get("full_text", "")
+        # Media attachments are appended as t.co links that the DOM never shows
+        for media in legacy.get("entities", {}).get("media", []):
+            tweet_text = tweet_text.replace(media.get("url", ""), "")
+    tweet_text = html.unescape(tweet_text).strip()
+
+    if not (screen_name and tweet_id and created_at and tweet_text):
+        logger.debug(f"Tweet result does not have the expected structure: {tweet_id}")
+        return None
+
+    try:
+        # created_at is UTC, e.g. "Wed Oct 10 20:19:24 +0000 2018"
+        post_time = datetime.strptime(created_at, "%a %b %d %H:%M:%S %z %Y").replace(tzinfo=None)
+    except ValueError as e:
+        logger.error(f"Invalid datetime format: {created_at} | Error: {e}", exc_info=True)
+        return None
+
+    return {
+        "category": category,
+        "tag": tag,
+        "username": f"@{screen_name}",
+        "tweetText": tweet_text,
+        "postTimeRaw": post_time,
+        "scrapeTime": scrape_time,
+        "tweet_link": f"https://x.com/{screen_name}/status/{tweet_id}",
+    }
+
+def parse_search_timeline(payload: dict, category: str, tag: str) -> dict[str, dict]:
+    scrape_time = datetime.now().strftime("%Y-%m-%dT%H:%M:%S")
+    tweets = {}
+    for result in iter_tweet_results(payload):
+        tweet = parse_tweet_result(result, category, tag, scrape_time)
+        if tweet:
+            tweets[tweet_result_id(result)] = tweet
+    return tweets
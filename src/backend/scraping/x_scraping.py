@@ -1,7 +1,6 @@
 import urllib.parse
 import asyncio
-from playwright.async_api import async_playwright
-import time
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
 from datetime import datetime
 import random
 import pandas as pd
@@ -9,18 +8,37 @@ import os
 
 # Import modern logging configuration
 from config.logging.modern_log import LoggingConfig
-# Import path configuration
-from config.path_config import AUTH_TWITTER
 # Import validation configuration
 from src.backend.validation.validate import ValidationPydantic, TweetData
 # Import LakeFS loader
-from src.backend.load.lakefs_loader import LakeFSLoader
+from src.backend.load.lakefs_loader import get_loader
+# Import tweet id parsing
+from config.tweet_id import tweet_id, tweet_ids
+# Import compact tweet dtypes
+from src.backend.load.schema import apply_dtypes
+# Import shared browser pool
+from src.backend.scraping.browser_pool import BrowserPool
+# Import adaptive request pacing
+from src.backend.scraping.pacing import AdaptivePacer
+# Import scrape state store
+from src.backend.scraping.state_store import ScrapeStateStore
+# Import in-page extraction script
+from src.backend.scraping.config_scraping import extract_articles_script
+# Import SearchTimeline response parser
+from src.backend.scraping.timeline_parser import is_search_timeline_response, parse_search_timeline
 
 logger = LoggingConfig(level="DEBUG", level_console="DEBUG").get_logger()
 
+EXTRACT_MODES = ("dom", "script", "network")
+
 class XScraping:
-    def __init__(self):
-        pass
+    def __init__(self, browser_pool: BrowserPool | None = None, extract_mode: str = "dom", pacer: AdaptivePacer | None = None, state_store: ScrapeStateStore | None = None):
+        if extract_mode not in EXTRACT_MODES:
+            raise ValueError(f"extract_mode must be one of {EXTRACT_MODES}, got '{extract_mode}'")
+        self.browser_pool = browser_pool
+        self.extract_mode = extract_mode
+        self.pacer = pacer or AdaptivePacer()
+        self.state_store = state_store
 
     def encode_tag_to_url(self, tags: dict[str, list[str]]) -> dict[str, dict[str, str]]:
         encoded_tags_by_category = {}
@@ -40,22 +58,69 @@ class XScraping:
     async def wait_for_articles_with_retry(self, page, max_retries: int =2) -> bool:
         for retry in range(max_retries):
             if await self.is_article_present(page):
+                self.pacer.on_success()
                 return True
             logger.warning(f"Retry {retry+1}/{max_retries} - Waiting before next try...")
-            await asyncio.sleep(random.uniform(10.0, 22.0))
+            self.pacer.on_failure()
+            await self.pacer.acquire()
         return False
 
+    async def wait_for_new_height(self, page, now_height: int, timeout: int = 10000) -> int:
+        try:
+            await page.wait_for_function("h => document.body.scrollHeight > h", arg=now_height, timeout=timeout)
+        except PlaywrightTimeoutError:
+            logger.debug(f"Page height did not grow past {now_height} within {timeout}ms")
+        return await page.evaluate("document.body.scrollHeight")
+
     async def is_article_present(self, page) -> bool:
         try:
             await page.wait_for_selector("article", timeout=5000)
             logger.debug("Found article on the page")
             return True
-        except TimeoutError as t:
+        except PlaywrightTimeoutError:
             logger.error(f"X Blocked us Please try again later 😢")
             await page.screenshot(path="tmp/debug_screenshot_no_tweets.png")
             return False
 
-    async def extract_articles(self, category: str, tag: str, count_tweets: int, articles: list, seen_pairs: set, all_tweet_entries: list) -> None:
+    def add_tweet_entry(self, category: str, tag: str, userName: str, tweetText: str, dateTime: str, tweet_link: str, seen_pairs: set, all_tweet_entries: list) -> bool:
+        if not (userName and tweetText and dateTime):
+            return False
+        try:
+            dt_naive = datetime.strptime(dateTime, "%Y-%m-%dT%H:%M:%S.%fZ")
+        except ValueError as e:
+            logger.error(f"Invalid datetime format: {dateTime} | Error: {e}", exc_info=True)
+            return False
+        key = (userName, tweetText)
+        # Stored and network-captured tweets are keyed by their status id as a string
+        status_id = str(tweet_id(tweet_link) or "")
+        if key in seen_pairs or (status_id and status_id in seen_pairs):
+            return False
+        seen_pairs.add(key)
+        if status_id:
+            seen_pairs.add(status_id)
+        all_tweet_entries.append({
+            "category": category,
+            "tag": tag,
+            "username": userName,
+            "tweetText": tweetText,
+            "postTimeRaw": dt_naive,
+            "scrapeTime": datetime.now().strftime("%Y-%m-%dT%H:%M:%S"),
+            "tweet_link": f"https://x.com{tweet_link}"
+        })
+        return True
+
+    async def extract_articles_in_page(self, page, category: str, tag: str, seen_pairs: set, all_tweet_entries: list) -> int:
+        records = await page.evaluate(extract_articles_script)
+        count_tweets = 0
+        for record in records:
+            if self.add_tweet_entry(category, tag, record["username"], record["text"], record["datetime"], record["link"], seen_pairs, all_tweet_entries):
+                count_tweets += 1
+        logger.debug(f"Extracted {count_tweets} new tweets from {len(records)} articles - {tag}")
+        # Tweets read on the page, seen or not, for the high-water stop check
+        return sum(1 for record in records if record["username"] and record["text"] and record["datetime"])
+
+    async def extract_articles(self, category: str, tag: str, count_tweets: int, articles: list, seen_pairs: set, all_tweet_entries: list) -> int:
+        read_tweets = 0
         for i, article in enumerate(articles):
             displayName = await article.query_selector("[data-testid='User-Name']")
             if not displayName:
@@ -70,7 +135,6 @@ class XScraping:
             if displayName:
                 spans = await displayName.query_selector_all("span")
                 time_tag = await displayName.query_selector("time")
-                asyncio.sleep(random.uniform(5.0, 11.5))
                 tweetText_tag = await article.query_selector("[data-testid='tweetText']")
                 if len(spans) > 3 and time_tag and tweetText_tag:
                     if len(spans) == 4:
@@ -82,84 +146,124 @@ class XScraping:
                     tweetText = await tweetText_tag.text_content()
                     tweetText = tweetText.strip()
 
-                    if userName and tweetText and dateTime:
-                        try:
-                            dt_naive = datetime.strptime(dateTime, "%Y-%m-%dT%H:%M:%S.%fZ")
-                            now = datetime.now()
-                            key = (userName, tweetText)
-                            if key not in seen_pairs:
-                                seen_pairs.add(key)
-                                all_tweet_entries.append({
-                                    "category": category,
-                                    "tag": tag,
-                                    "username": userName,
-                                    "tweetText": tweetText,
-                                    "postTimeRaw": dt_naive,
-                                    "scrapeTime": now.strftime("%Y-%m-%dT%H:%M:%S"),
-                                    "tweet_link": f"https://x.com{tweet_link}"
-                                })
-                                count_tweets += 1
-                                logger.debug(f"Scraped tweet {count_tweets} - {tag}")
-                        except ValueError as e:
-                            logger.error(f"Invalid datetime format: {dateTime} | Error: {e}", exc_info=True)
+                    read_tweets += 1
+                    if self.add_tweet_entry(category, tag, userName, tweetText, dateTime, tweet_link, seen_pairs, all_tweet_entries):
+                        count_tweets += 1
+                        logger.debug(f"Scraped tweet {count_tweets} - {tag}")
                         
                 else:
                     logger.debug("Tweet does not have the expected structure.")
             else:
                 logger.debug("No display name found for the article.")
+        return read_tweets
+
+    def extract_timeline(self, category: str, tag: str, timeline_payloads: list, seen_pairs: set, all_tweet_entries: list) -> int:
+        read_tweets = 0
+        while timeline_payloads:
+            payload = timeline_payloads.pop(0)
+            for status_id, tweet in parse_search_timeline(payload, category, tag).items():
+                read_tweets += 1
+                if status_id not in seen_pairs:
+                    seen_pairs.add(status_id)
+                    all_tweet_entries.append(tweet)
+                    logger.debug(f"Captured tweet {len(all_tweet_entries)} - {tag}")
+        return read_tweets
+
+    def trim_to_high_water(self, all_tweet_entries: list, start: int, since: datetime, read_tweets: int) -> bool:
+        page_entries = all_tweet_entries[start:]
+        fresh_entries = [entry for entry in page_entries if entry["postTimeRaw"] > since]
+        all_tweet_entries[start:] = fresh_entries
+        if len(fresh_entries) < len(page_entries):
+            logger.debug(f"Dropped {len(page_entries) - len(fresh_entries)} tweets at or before {since}")
+        # Stop once the scroll read tweets and each was already seen or at or before the mark;
+        # a scroll that read nothing proves nothing: the SearchTimeline response may not be parsed yet
+        return read_tweets > 0 and not fresh_entries
 
-    async def scrape_all_tweet_texts(self, category: str, tag: str, tag_url: str, max_scrolls: int = 1, view_browser: bool = True) -> list[dict]:
+    async def scrape_all_tweet_texts(self, category: str, tag: str, tag_url: str, max_scrolls: int = 1, view_browser: bool = True, since: datetime | None = None) -> list[dict]:
+        if self.browser_pool is not None:
+            async with self.browser_pool.page() as page:
+                return await self.scrape_page(page, category, tag, tag_url, max_scrolls, since)
+
+        async with BrowserPool(num_browsers=1, pages_per_browser=1, headless=view_browser) as browser_pool:
+            async with browser_pool.page() as page:
+                return await self.scrape_page(page, category, tag, tag_url, max_scrolls, since)
+
+    async def scrape_page(self, page, category: str, tag: str, tag_url: str, max_scrolls: int = 1, since: datetime | None = None) -> list[dict]:
         logger.debug(f"Starting scraping: {tag}")
         all_tweet_entries = []
-        seen_pairs = set() 
+        # Tweets already stored by earlier runs count as seen and are never re-extracted
+        seen_pairs = self.state_store.recent_keys(tag) if self.state_store else set()
         count_tweets = 0
-        async with async_playwright() as p:
-            browser = await p.chromium.launch(headless=view_browser)
-            context = await browser.new_context(
-                storage_state=AUTH_TWITTER,
-                viewport={"width": 1280, "height": 1024}
-            )
-            page = await context.new_page()
+        timeline_payloads = []
+
+        async def capture_timeline(response):
+            if not is_search_timeline_response(response.url) or not response.ok:
+                return
+            try:
+                timeline_payloads.append(await response.json())
+            except Exception as e:
+                logger.debug(f"Could not read SearchTimeline response: {e}")
+
+        if self.extract_mode == "network":
+            page.on("response", capture_timeline)
+        try:
+            await self.pacer.acquire()
             await page.goto(tag_url)
-            await asyncio.sleep(random.uniform(10, 20.0))
 
             # Check if the page has loaded tweets
             if not await self.wait_for_articles_with_retry(page):
                 logger.error(f"No articles found for tag: {tag} (Initial load)")
-                await browser.close()
                 return all_tweet_entries
 
             now_height = 0
             for i in range(max_scrolls):
                 if i > 0:
+                    await self.pacer.acquire()
                     scroll_distance = random.randint(2800, 3800)
                     await page.evaluate(f"window.scrollBy(0, {scroll_distance});")
                     logger.debug(f"Scroll attempt {i+1}/{max_scrolls} - Scrolling by {scroll_distance}px")
-                    await asyncio.sleep(random.uniform(10, 17))
                     # Check if the page has loaded tweets
                     if not await self.wait_for_articles_with_retry(page):
                         logger.warning(f"No articles found on scroll {i+1}")
                         break
-                
+            
                 logger.debug(f"Scroll attempt {i+1}/{max_scrolls} - {tag}")
-                new_height = await page.evaluate("document.body.scrollHeight")
-                await asyncio.sleep(random.uniform(9, 14))
+                new_height = await self.wait_for_new_height(page, now_height)
                 logger.debug(f"Now height: {now_height} - New height after scroll: {new_height}")
-                
+            
                 if new_height == now_height:
                     logger.debug("Reached bottom of page or no new content loaded.")
                     break
                 now_height = new_height
 
-                articles = await page.query_selector_all("article")
-                if articles:
-                    await self.extract_articles(category, tag, count_tweets, articles, seen_pairs, all_tweet_entries)
+                n_before = len(all_tweet_entries)
+                if self.extract_mode == "network":
+                    read_tweets = self.extract_timeline(category, tag, timeline_payloads, seen_pairs, all_tweet_entries)
+                elif self.extract_mode == "script":
+                    read_tweets = await self.extract_articles_in_page(page, category, tag, seen_pairs, all_tweet_entries)
                 else:
-                    logger.debug("No articles found on the page.")
+                    articles = await page.query_selector_all("article")
+                    if articles:
+                        read_tweets = await self.extract_articles(category, tag, count_tweets, articles, seen_pairs, all_tweet_entries)
+                    else:
+                        logger.debug("No articles found on the page.")
+                        break
+
+                # Stop once a scroll brings nothing newer than what is already stored
+                if since is not None and self.trim_to_high_water(all_tweet_entries, n_before, since, read_tweets):
+                    logger.info(f"Reached high-water mark {since} for {tag} after {i+1} scroll(s)")
                     break
-            
-            await browser.close()
-            logger.info(f"Finished scraping tag: {tag} | Total tweets: {len(all_tweet_entries)}")
+
+            if self.extract_mode == "network":
+                n_before = len(all_tweet_entries)
+                read_tweets = self.extract_timeline(category, tag, timeline_payloads, seen_pairs, all_tweet_entries)
+                if since is not None:
+                    self.trim_to_high_water(all_tweet_entries, n_before, since, read_tweets)
+        finally:
+            if self.extract_mode == "network":
+                page.remove_listener("response", capture_timeline)
+
+        logger.info(f"Finished scraping tag: {tag} | Total tweets: {len(all_tweet_entries)} | Request rate: {self.pacer.observed_rate:.3f} req/s")
 
         return all_tweet_entries
 
@@ -167,24 +271,24 @@ class XScraping:
     def to_dataframe(all_tweet: list[dict]) -> pd.DataFrame:
         logger.info(f"Converting to dataframe...")
         all_tweet = pd.DataFrame(all_tweet)
-        all_tweet['category'] = all_tweet['category'].astype('string')
-        all_tweet['username'] = all_tweet['username'].astype('string')
-        all_tweet['tweetText'] = all_tweet['tweetText'].astype('string')
-        all_tweet['tag'] = all_tweet['tag'].astype('string')
-        all_tweet['tweet_link'] = all_tweet['tweet_link'].astype('string')
+        all_tweet['tweet_id'] = tweet_ids(all_tweet['tweet_link'])
+        missing_id = all_tweet['tweet_id'].isna()
+        if missing_id.any():
+            logger.warning(f"Dropping {missing_id.sum()} tweets without a status id in their link")
+            all_tweet = all_tweet[~missing_id].reset_index(drop=True)
+        all_tweet['postTimeRaw'] = pd.to_datetime(all_tweet['postTimeRaw'])
+        all_tweet['scrapeTime'] = pd.to_datetime(all_tweet['scrapeTime'])
 
         all_tweet['year'] = all_tweet['postTimeRaw'].dt.year
         all_tweet['month'] = all_tweet['postTimeRaw'].dt.month
         all_tweet['day'] = all_tweet['postTimeRaw'].dt.day
-
-        all_tweet['postTimeRaw'] = pd.to_datetime(all_tweet['postTimeRaw'])
-        all_tweet['scrapeTime'] = pd.to_datetime(all_tweet['scrapeTime'])
+        all_tweet = apply_dtypes(all_tweet)
         logger.info("Finished converting to dataframe.")
         return all_tweet
 
     @staticmethod
     def load_to_lakefs(data: pd.DataFrame, lakefs_endpoint: str):
-        LakeFSLoader(host=lakefs_endpoint).load(data=data, lakefs_endpoint=lakefs_endpoint)
+        get_loader(host=lakefs_endpoint).load(data=data, lakefs_endpoint=lakefs_endpoint)
 
 async def main():
     tags = {
@@ -348,11 +452,12 @@ async def main():
         # ],
     }
 
-    x_scraping = XScraping()
+    browser_pool = BrowserPool(num_browsers=1, pages_per_browser=3)
+    x_scraping = XScraping(browser_pool=browser_pool)
     tag_urls = x_scraping.encode_tag_to_url(tags)
 
 
-    semaphore = asyncio.Semaphore(3)
+    semaphore = asyncio.Semaphore(browser_pool.size)
     all_results = []
 
     async def scrape_with_limit(category: str, tag: str, url: str):
@@ -367,7 +472,8 @@ async def main():
 
     logger.info(f"Starting scraping with {len(tasks)} tasks, max 3 concurrently...")
     # tasks = [x_scraping.scrape_all_tweet_texts(tag=tag, tag_url=tag_urls[tag]) for tag in tag_urls.keys()]
-    results = await asyncio.gather(*tasks)
+    async with browser_pool:
+        results = await asyncio.gather(*tasks)
 
     for result in results:
         all_results.extend(result)
@@ -10,6 +10,7 @@ from config.logging.modern_log import LoggingConfig
 logger = LoggingConfig(level="DEBUG", level_console="INFO").get_logger()
 
 class TweetData(BaseModel):
+    tweet_id: int
     username: str
     tweetText: str
     scrapeTime: datetime
@@ -1,14 +1,25 @@
 import streamlit as st 
 import os
+import json
+import base64
+import urllib.request
+import urllib.error
+import fsspec
 import pandas as pd 
+import pyarrow as pa
+import pyarrow.dataset as ds
 from datetime import datetime, time, timedelta
 from streamlit_echarts import st_echarts
 import altair as alt
 
 # Import config_streamlit 
 from config_streamlit import random_color
+# Import tweet card rendering
+from tweet_cards import render_tweet_cards
+# Import tweet id parsing
+from config.tweet_id import tweet_ids
 # Import path configuration
-from config.path_config import lakefs_s3_path, lakefs_s3_path_ml
+from config.path_config import lakefs_s3_path, lakefs_s3_path_ml, lakefs_s3_path_rollup, lakefs_s3_path_subtopics, lakefs_s3_path_subtopic_index, ROLLUP_FREQ, DATASET_SUMMARY_SUFFIX, tags as configured_tags
 
 st.set_page_config(layout="wide")
 
@@ -36,48 +47,29 @@ st.markdown("""
 
 if 'submitted' not in st.session_state:
     st.session_state.submitted = False
-if "refresh_key" not in st.session_state:
-    st.session_state.refresh_key = 0
 
 status_topic_ml = False
 status_subtopic_ml = False
 
 def event_handler():
     st.session_state.submitted = True
-    st.session_state.refresh_key += 1
 
 @st.cache_data
 def load_css(file_name):
     with open(file_name) as f:
         st.markdown(f'<style>{f.read()}</style>', unsafe_allow_html=True)
 
-def wordcloud_generate(df: pd.DataFrame):
-    def generate_options(df: pd.DataFrame) -> list[dict]:
-        def remove_stopwords(word_list, stopwords):
-            return [word for word in word_list if word not in stopwords]
-        stop_word = list(
-            set(
-                word
-                for tags in df['tag'].dropna()
-                for word in tags.split("#")
-                if word.strip() 
-            )
-        )
-        all_filtered_df_wordcloud = filtered_df_wordcloud['subtopic'].explode().values.tolist()
-        filtered_faq_all = remove_stopwords(all_filtered_df_wordcloud, stop_word)
-        result = [
-            {
-                "name": topic, 
-                "value": filtered_faq_all.count(topic),
-                "textStyle": {
-                    "color": random_color() 
-                }
+def wordcloud_generate(topic_totals: pd.Series):
+    all_result = [
+        {
+            "name": topic, 
+            "value": int(count),
+            "textStyle": {
+                "color": random_color() 
             }
-            for topic in set(filtered_faq_all)
-        ]
-        return result
-        
-    all_result = generate_options(filtered_df_wordcloud)
+        }
+        for topic, count in topic_totals.items()
+    ]
 
     options_all = {
         "title": {
@@ -133,15 +125,8 @@ def wordcloud_generate(df: pd.DataFrame):
 
     return event_word_cloud_all
 
-def barchart_generate(df: pd.DataFrame):
-    all_faq_subtopics_list = df['subtopic'].explode().values.tolist()
-
-    all_faq_subtopics_count =pd.DataFrame(all_faq_subtopics_list)\
-                .value_counts().to_frame()\
-                .sort_values(by='count', ascending=False)\
-                .reset_index()\
-                [:10]
-    all_faq_subtopics_count.columns = ['subtopic', 'count']
+def barchart_generate(topic_totals: pd.Series):
+    all_faq_subtopics_count = topic_totals.head(10).rename_axis('subtopic').reset_index(name='count')
     chart = alt.Chart(all_faq_subtopics_count).mark_bar().encode(
         x=alt.X('count', title='Count'),
         y=alt.Y('subtopic', sort='-x', title='Topic'),
@@ -153,39 +138,187 @@ def barchart_generate(df: pd.DataFrame):
 
     st.altair_chart(chart)
 
-@st.cache_data(ttl=600)
-def data_from_lakefs(refresh_key: int = None, lakefs_endpoint: str = "http://lakefsdb:8000/", columns: list[str] = None):
-    storage_options = {
+LAKEFS_ENDPOINT = "http://lakefsdb:8000/"
+# Only the columns the dashboard shows are fetched from LakeFS
+TWEET_COLUMNS = ["postTimeRaw", "category", "tag", "username", "tweetText", "tweet_link", "tweet_id"]
+# Columns added after the first files were written; older files read them as nulls
+LATE_FIELDS = {"tweet_id": pa.int64()}
+ROLLUP_COLUMNS = ["bucket", "tag", "count"]
+SUBTOPIC_COLUMNS = ["bucket", "tag", "subtopic", "count"]
+
+def lakefs_storage_options(lakefs_endpoint: str = LAKEFS_ENDPOINT) -> dict:
+    return {
         "key": os.getenv("ACCESS_KEY"),
         "secret": os.getenv("SECRET_KEY"),
         "client_kwargs": {
             "endpoint_url": lakefs_endpoint
         }
     }
-    df = pd.read_parquet(
-        lakefs_s3_path,
-        columns=columns,
-        storage_options=storage_options,
+
+@st.cache_data(ttl=15, show_spinner=False)
+def lakefs_commit_id(s3_path: str, lakefs_endpoint: str = LAKEFS_ENDPOINT) -> str:
+    # Cheap ref lookup: only the branch head commit id, no data transfer
+    repo, ref = s3_path.removeprefix("s3://").split("/")[:2]
+    request = urllib.request.Request(f"{lakefs_endpoint.rstrip('/')}/api/v1/repositories/{repo}/branches/{ref}")
+    credentials = base64.b64encode(f"{os.getenv('ACCESS_KEY')}:{os.getenv('SECRET_KEY')}".encode()).decode()
+    request.add_header("Authorization", f"Basic {credentials}")
+    try:
+        with urllib.request.urlopen(request, timeout=5) as response:
+            return json.load(response)["commit_id"]
+    except (urllib.error.URLError, KeyError, ValueError):
+        # Fall back to the branch itself, re-read at most every 10 minutes like before
+        return f"{ref}@{int(datetime.now().timestamp() // 600)}"
+
+def pinned_path(s3_path: str, commit_id: str) -> str:
+    repo, ref, key = s3_path.removeprefix("s3://").split("/", 2)
+    if "@" in commit_id:
+        return s3_path
+    return f"s3://{repo}/{commit_id}/{key}"
+
+@st.cache_resource(max_entries=4, show_spinner="Loading data from LakeFS...")
+def read_lakefs_dataset(s3_path: str, commit_id: str, columns: tuple[str, ...] | None = None, lakefs_endpoint: str = LAKEFS_ENDPOINT) -> pd.DataFrame:
+    # Commits are immutable, so one shared copy per commit serves every session
+    return pd.read_parquet(
+        pinned_path(s3_path, commit_id),
+        columns=list(columns) if columns else None,
+        storage_options=lakefs_storage_options(lakefs_endpoint),
         engine='pyarrow',
     )
-    return df
 
-@st.cache_data(ttl=600)
-def wordcloud_from_lakefs(lakefs_endpoint: str = "http://lakefsdb:8000/", columns: list[str] = None):
-    storage_options = {
-        "key": os.getenv("ACCESS_KEY"),
-        "secret": os.getenv("SECRET_KEY"),
-        "client_kwargs": {
-            "endpoint_url": lakefs_endpoint
-        }
-    }
-    df = pd.read_parquet(
-        lakefs_s3_path_ml,
-        columns=columns,
-        storage_options=storage_options,
-        engine='pyarrow',
+@st.cache_resource
+def lakefs_filesystem(lakefs_endpoint: str = LAKEFS_ENDPOINT):
+    return fsspec.filesystem("s3", **lakefs_storage_options(lakefs_endpoint))
+
+def window_filter(tags: tuple[str, ...], start_datetime: datetime, end_datetime: datetime, time_column: str = "postTimeRaw", match: tuple[tuple[str, tuple], ...] = ()) -> ds.Expression:
+    # Partition predicates let pyarrow skip whole year/month/day directories before opening any file
+    days_by_month = {}
+    for day in pd.date_range(start_datetime.date(), end_datetime.date(), freq="D"):
+        days_by_month.setdefault((day.year, day.month), []).append(day.day)
+    partitions = None
+    for (year, month), days in days_by_month.items():
+        month_filter = (ds.field("year") == year) & (ds.field("month") == month) & ds.field("day").isin(days)
+        partitions = month_filter if partitions is None else partitions | month_filter
+    rows = (
+        ds.field("tag").isin(list(tags))
+        & (ds.field(time_column) >= start_datetime)
+        & (ds.field(time_column) <= end_datetime)
+    )
+    for column, values in match:
+        rows = rows & ds.field(column).isin(list(values))
+    return rows if partitions is None else partitions & rows
+
+@st.cache_data(max_entries=32, show_spinner="Querying LakeFS...")
+def query_lakefs_dataset(s3_path: str, commit_id: str, tags: tuple[str, ...], start_datetime: datetime, end_datetime: datetime, columns: tuple[str, ...], lakefs_endpoint: str = LAKEFS_ENDPOINT, time_column: str = "postTimeRaw", match: tuple[tuple[str, tuple], ...] = ()) -> pd.DataFrame:
+    dataset = ds.dataset(
+        pinned_path(s3_path, commit_id).removeprefix("s3://"),
+        filesystem=lakefs_filesystem(lakefs_endpoint),
+        format="parquet",
+        partitioning="hive",
     )
-    return df
+    # The schema comes from the first file, which may predate a late column that later files carry
+    late_fields = [pa.field(column, LATE_FIELDS[column]) for column in columns if column in LATE_FIELDS and column not in dataset.schema.names]
+    if late_fields:
+        dataset = ds.dataset(
+            pinned_path(s3_path, commit_id).removeprefix("s3://"),
+            schema=pa.schema(list(dataset.schema) + late_fields),
+            filesystem=lakefs_filesystem(lakefs_endpoint),
+            format="parquet",
+            partitioning="hive",
+        )
+    table = dataset.to_table(columns=list(columns), filter=window_filter(tags, start_datetime, end_datetime, time_column, match))
+    return table.to_pandas()
+
+def tweets_in_window(tags: list[str], start_datetime: datetime, end_datetime: datetime, columns: list[str] = TWEET_COLUMNS, lakefs_endpoint: str = LAKEFS_ENDPOINT) -> pd.DataFrame:
+    commit_id = lakefs_commit_id(lakefs_s3_path, lakefs_endpoint)
+    tweets = query_lakefs_dataset(lakefs_s3_path, commit_id, tuple(tags), start_datetime, end_datetime, tuple(columns), lakefs_endpoint)
+    if "tweet_id" in tweets.columns:
+        ids = tweets["tweet_id"].astype("Int64")
+        # Rows stored before tweet_id existed only carry their link
+        missing = ids.isna()
+        if missing.any():
+            ids[missing] = tweet_ids(tweets.loc[missing, "tweet_link"])
+        tweets["tweet_id"] = ids
+    return tweets
+
+def subtopic_tweet_ids(subtopic: str, tags: list[str], start_datetime: datetime, end_datetime: datetime, lakefs_endpoint: str = LAKEFS_ENDPOINT) -> pd.Series:
+    commit_id = lakefs_commit_id(lakefs_s3_path_subtopic_index, lakefs_endpoint)
+    try:
+        index = query_lakefs_dataset(lakefs_s3_path_subtopic_index, commit_id, tuple(tags), start_datetime, end_datetime, ("tweet_id",), lakefs_endpoint, match=(("subtopic", (subtopic,)),))
+    except FileNotFoundError:
+        # No index written yet: scan the window's word cloud rows for the subtopic instead
+        commit_id = lakefs_commit_id(lakefs_s3_path_ml, lakefs_endpoint)
+        try:
+            rows = query_lakefs_dataset(lakefs_s3_path_ml, commit_id, tuple(tags), start_datetime, end_datetime, ("subtopic", "tweet_link"), lakefs_endpoint)
+        except FileNotFoundError:
+            return pd.Series(dtype="Int64")
+        rows = rows.explode("subtopic")
+        return tweet_ids(rows.loc[rows["subtopic"] == subtopic, "tweet_link"])
+    return index["tweet_id"]
+
+def rollup_in_window(tags: list[str], start_datetime: datetime, end_datetime: datetime, lakefs_endpoint: str = LAKEFS_ENDPOINT) -> pd.DataFrame:
+    # Include the bucket the window starts in
+    bucket_start = pd.Timestamp(start_datetime).floor(ROLLUP_FREQ).to_pydatetime()
+    commit_id = lakefs_commit_id(lakefs_s3_path_rollup, lakefs_endpoint)
+    try:
+        return query_lakefs_dataset(lakefs_s3_path_rollup, commit_id, tuple(tags), bucket_start, end_datetime, tuple(ROLLUP_COLUMNS), lakefs_endpoint, time_column="bucket")
+    except FileNotFoundError:
+        # No rollup written yet: count the raw tweets of the window instead
+        tweets = tweets_in_window(tags, start_datetime, end_datetime, ["postTimeRaw", "tag"], lakefs_endpoint)
+        return (
+            tweets.assign(bucket=tweets["postTimeRaw"].dt.floor(ROLLUP_FREQ))
+            .groupby(["bucket", "tag"], observed=True).size()
+            .rename("count").reset_index()
+        )
+
+def subtopic_totals(tags: list[str], start_datetime: datetime, end_datetime: datetime, lakefs_endpoint: str = LAKEFS_ENDPOINT) -> pd.Series:
+    # One aggregation feeds both the bar chart and the word cloud
+    bucket_start = pd.Timestamp(start_datetime).floor(ROLLUP_FREQ).to_pydatetime()
+    commit_id = lakefs_commit_id(lakefs_s3_path_subtopics, lakefs_endpoint)
+    try:
+        counts = query_lakefs_dataset(lakefs_s3_path_subtopics, commit_id, tuple(tags), bucket_start, end_datetime, tuple(SUBTOPIC_COLUMNS), lakefs_endpoint, time_column="bucket")
+    except FileNotFoundError:
+        return wordcloud_subtopic_totals(tags, start_datetime, end_datetime, lakefs_endpoint)
+    return counts.groupby("subtopic")["count"].sum().sort_values(ascending=False)
+
+def wordcloud_subtopic_totals(tags: list[str], start_datetime: datetime, end_datetime: datetime, lakefs_endpoint: str = LAKEFS_ENDPOINT) -> pd.Series:
+    # No subtopic counts written yet: count the word cloud rows of the window, minus hashtag words as the pipeline does
+    commit_id = lakefs_commit_id(lakefs_s3_path_ml, lakefs_endpoint)
+    try:
+        rows = query_lakefs_dataset(lakefs_s3_path_ml, commit_id, tuple(tags), start_datetime, end_datetime, ("tag", "subtopic"), lakefs_endpoint)
+    except FileNotFoundError:
+        return pd.Series(dtype="int64")
+    all_tags = [*(tag for category_tags in configured_tags.values() for tag in category_tags), *rows["tag"].dropna().unique()]
+    stop_words = {word.strip() for tag in all_tags for word in str(tag).split("#") if word.strip()}
+    subtopics = rows["subtopic"].explode().dropna()
+    return subtopics[~subtopics.isin(stop_words)].value_counts()
+
+def timeline_pivot(rollup: pd.DataFrame, time_group: str) -> pd.DataFrame:
+    # Coarser groupings are sums of the stored buckets
+    return (
+        rollup.groupby([pd.Grouper(key="bucket", freq=time_group), "tag"], observed=True)["count"].sum()
+        .unstack("tag", fill_value=0)
+        .rename_axis("postTimeRaw")
+    )
+
+@st.cache_data(max_entries=8, show_spinner=False)
+def read_dataset_summary(s3_path: str, commit_id: str, lakefs_endpoint: str = LAKEFS_ENDPOINT) -> dict:
+    # A few hundred bytes written by the loader next to the dataset
+    summary_path = pinned_path(f"{s3_path}{DATASET_SUMMARY_SUFFIX}", commit_id)
+    try:
+        with lakefs_filesystem(lakefs_endpoint).open(summary_path.removeprefix("s3://"), "r") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        # Until the loader first writes the summary, fall back to scanning the two columns
+        df = read_lakefs_dataset(s3_path, commit_id, ("tag", "postTimeRaw"), lakefs_endpoint)
+        return {
+            "tags": sorted(str(tag) for tag in df["tag"].dropna().unique()),
+            "min_post_time": df["postTimeRaw"].min().isoformat(),
+            "max_post_time": df["postTimeRaw"].max().isoformat(),
+        }
+
+def dataset_summary(lakefs_endpoint: str = LAKEFS_ENDPOINT) -> dict:
+    commit_id = lakefs_commit_id(lakefs_s3_path, lakefs_endpoint)
+    return read_dataset_summary(lakefs_s3_path, commit_id, lakefs_endpoint)
 
 def convert_df_to_echart_option(df: pd.DataFrame):
     df = df.reset_index()
@@ -230,10 +363,10 @@ def convert_df_to_echart_option(df: pd.DataFrame):
 load_css("./src/frontend/styles/style.css")
 
 
-df_tag_time = data_from_lakefs(columns=['tag', 'postTimeRaw'])
-min_date = df_tag_time["postTimeRaw"].min().date()
-max_date = df_tag_time["postTimeRaw"].max().date()
-unique_tags = df_tag_time["tag"].unique().tolist()
+summary = dataset_summary()
+min_date = datetime.fromisoformat(summary["min_post_time"]).date()
+max_date = datetime.fromisoformat(summary["max_post_time"]).date()
+unique_tags = summary["tags"]
 
 with st.form("my_form"):
     selected_tags = st.multiselect("เลือก hashtag (tag):", unique_tags, default=unique_tags[0])
@@ -253,22 +386,14 @@ if st.session_state.submitted:
     # st.write(f"Start date: {start_date} - End date: {end_date}")
     # st.write(f"Start time: {start_time} - End time: {end_time}")
 
-    df = data_from_lakefs(refresh_key=st.session_state.refresh_key)
-
     start_datetime = datetime.combine(start_date, start_time)
     end_datetime = datetime.combine(end_date, end_time)
 
-    filtered_df = df[
-        (df["tag"].isin(selected_tags)) & 
-        (df["postTimeRaw"] >= start_datetime) & 
-        (df["postTimeRaw"] <= end_datetime)
-    ]
+    filtered_df = tweets_in_window(selected_tags, start_datetime, end_datetime)
     if len(filtered_df) != 0:
         df_filtered = filtered_df.set_index("postTimeRaw")
-        df_grouped = df_filtered.groupby([pd.Grouper(freq=time_group), "tag"]).size().reset_index(name="count")
-
-        df_pivot = df_grouped.pivot(index="postTimeRaw", columns="tag", values="count").fillna(0)
-        dataframe_display = df_filtered.drop(columns=['index', 'year', 'month', 'day', 'scrapeTime'])
+        df_pivot = timeline_pivot(rollup_in_window(selected_tags, start_datetime, end_datetime), time_group)
+        dataframe_display = df_filtered
         st.dataframe(
             dataframe_display,
             column_config={
@@ -277,7 +402,8 @@ if st.session_state.submitted:
                 "tag": "Hashtag",
                 "username": "Username",
                 "tweetText": "Tweet",
-                "tweet_link": st.column_config.LinkColumn(label="Link")
+                "tweet_link": st.column_config.LinkColumn(label="Link"),
+                "tweet_id": None,
             },
         )
 
@@ -294,114 +420,30 @@ if st.session_state.submitted:
         #     st.subheader("จำนวน Hashtag ทั้งหมด")
         #     st.write(df_grouped)
 
-        df_wordcloud = wordcloud_from_lakefs()
         # main
-        filtered_df_wordcloud = df_wordcloud[
-            (df_wordcloud["tag"].isin(selected_tags)) & 
-            (df_wordcloud["postTimeRaw"] >= start_datetime) & 
-            (df_wordcloud["postTimeRaw"] <= end_datetime)
-        ]  
+        topic_totals = subtopic_totals(selected_tags, start_datetime, end_datetime)
 
-        if len(filtered_df_wordcloud) > 0:
+        if not topic_totals.empty:
             # Barchart
-            barchart_generate(df=filtered_df_wordcloud)
+            barchart_generate(topic_totals=topic_totals)
 
             st.write('')
             st.write('')
 
             # Word Cloud
-            event_word_cloud_all = wordcloud_generate(df=filtered_df_wordcloud)
+            event_word_cloud_all = wordcloud_generate(topic_totals=topic_totals)
 
             if event_word_cloud_all:
-
                 st.subheader(f"ผลลัพธ์สำหรับ: {event_word_cloud_all}")
                 
-                filtered = filtered_df_wordcloud[
-                    filtered_df_wordcloud['subtopic'].apply(lambda x: event_word_cloud_all in x)
-                ]
-                filtered = filtered[['tweetText', 'tag', 'postTimeRaw']]
-                if not filtered.empty:
-                    # st.write(filtered)
-                    nb_columns = 3
-                    cols_info = st.columns(nb_columns)
-                    filtered = filtered.reset_index(drop=True)
-                    df_filtered_m = df_filtered.reset_index()[['tweetText', 'tag', 'postTimeRaw', 'tweet_link']]
-                    merged_df_tweet = pd.merge(
-                        filtered,
-                        df_filtered_m[['tweetText', 'tag', 'postTimeRaw', 'tweet_link']],
-                        on=['tweetText', 'tag', 'postTimeRaw'],
-                        how='left' 
-                    )
-                    # st.write(merged_df_tweet)
-                    mid = nb_columns // 2
-                    order = []
-                    for i in range(nb_columns):
-                        if i % 2 == 0:
-                            order.append(mid + i // 2)
-                        else:
-                            order.append(mid - (i + 1) // 2)
-                    for index, tweet in merged_df_tweet.iterrows():
-                        col_index = order[index % nb_columns]
-                        postTimeRaw_text = str(tweet['postTimeRaw']).strip()
-                        tweetText_text = str(tweet['tweetText']).strip().replace('\n','<br>')
-                        tweet_link = str(tweet['tweet_link']).strip()
-                        with cols_info[col_index]:
-                            st.markdown(f"""
-                            <style>
-                            .box {{
-                                padding: 1em 1em 0 1em;
-                                border-radius: 15px;
-                                background-color: #FFFFFF;
-                                box-shadow: 0 4px 8px rgba(0, 0, 0, 0.1);
-                                transition: box-shadow 0.4s ease-in-out, transform 0.3s ease-in-out;
-                                display: flex;
-                                flex-direction: column;
-                                margin: 1em;
-                            }}
-                            .box:hover {{
-                                box-shadow: 0 12px 24px rgba(0, 0, 0, 0.2);
-                                transform: translateY(-4px);
-                            }}
-                            .logo {{
-                                padding-bottom: 1em;
-                                display: flex;
-                                justify-content: space-between;
-                            }}
-                            .info p{{
-                                text-align: left;
-                                padding-left: 2.5em;
-                                padding-right: 2.5em;
-                            }}
-                            .foot p{{
-                                opacity: 40%;
-                                text-align: right;
-                                margin-bottom: 0.7em;
-                            }}
-                            .xlink {{
-                                color: black;
-                                opacity: 40%;
-                                transition: opacity 0.2s ease-in-out;
-                            }}
-                            .xlink:hover {{
-                                color: black;
-                                opacity: 70%;
-                            }}
-                            </style>
-                            <div class="box">
-                                <div class="logo">
-                                    <svg width="20" height="20.7" viewBox="0 0 1200 1227" fill="none" xmlns="http://www.w3.org/2000/svg">
-                                        <path d="M714.163 519.284L1160.89 0H1055.03L667.137 450.887L357.328 0H0L468.492 681.821L0 1226.37H105.866L515.491 750.218L842.672 1226.37H1200L714.137 519.284H714.163ZM569.165 687.828L521.697 619.934L144.011 79.6944H306.615L611.412 515.685L658.88 583.579L1055.08 1150.3H892.476L569.165 687.854V687.828Z" fill="black"/>
-                                    </svg>
-                                    <a href="{tweet_link}" class="xlink" style="color: black;">x.com</a>
-                                </div>
-                                <div class="info">
-                                    <p>{tweetText_text}</p>
-                                </div>
-                                <div class="foot">
-                                    <p>{postTimeRaw_text}</p>
-                                </div>
-                            </div>
-                            """, unsafe_allow_html=True)
+                # Index lookup for the clicked subtopic, then a join on tweet_id with the tweets already on screen
+                matched_ids = subtopic_tweet_ids(event_word_cloud_all, selected_tags, start_datetime, end_datetime)
+                merged_df_tweet = filtered_df.loc[
+                    filtered_df["tweet_id"].isin(matched_ids).to_numpy(dtype=bool, na_value=False),
+                    ['tweetText', 'tag', 'postTimeRaw', 'tweet_link']
+                ].reset_index(drop=True)
+                if not merged_df_tweet.empty:
+                    render_tweet_cards(merged_df_tweet, key=event_word_cloud_all)
 
     else:
         st.markdown("<h1 style='opacity: 40%;text-align: center;'>Not Found</h1>", unsafe_allow_html=True)
@@ -0,0 +1,46 @@
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+X_LOGO = """<svg width="20" height="20.7" viewBox="0 0 1200 1227" fill="none" xmlns="http://www.w3.org/2000/svg"><path d="M714.163 519.284L1160.89 0H1055.03L667.137 450.887L357.328 0H0L468.492 681.821L0 1226.37H105.866L515.491 750.218L842.672 1226.37H1200L714.137 519.284H714.163ZM569.165 687.828L521.697 619.934L144.011 79.6944H306.615L611.412 515.685L658.88 583.579L1055.08 1150.3H892.476L569.165 687.854V687.828Z" fill="black"/></svg>"""
+
+def escape_html(values: pd.Series) -> pd.Series:
+    return (
+        values.astype(str).str.strip()
+        .str.replace("&", "&amp;", regex=False)
+        .str.replace("<", "&lt;", regex=False)
+        .str.replace(">", "&gt;", regex=False)
+        .str.replace('"', "&quot;", regex=False)
+    )
+
+def build_cards(df: pd.DataFrame) -> pd.Series:
+    # Card styles live in styles/style.css, so each card is markup only
+    text = escape_html(df["tweetText"]).str.replace("\n", "<br>", regex=False)
+    return (
+        '<div class="box"><div class="logo">' + X_LOGO
+        + '<a href="' + escape_html(df["tweet_link"]) + '" class="xlink">x.com</a></div>'
+        + '<div class="info"><p>' + text + '</p></div>'
+        + '<div class="foot"><p>' + escape_html(df["postTimeRaw"]) + '</p></div></div>'
+    )
+
+def column_order(nb_columns: int) -> list[int]:
+    # Fill the middle column first, then alternate outwards
+    mid = nb_columns // 2
+    return [mid + i // 2 if i % 2 == 0 else mid - (i + 1) // 2 for i in range(nb_columns)]
+
+def render_tweet_cards(df: pd.DataFrame, key: str, page_size: int = 30, nb_columns: int = 3) -> None:
+    state_key = f"tweet_cards_{key}"
+    visible = st.session_state.get(state_key, page_size)
+    cards = build_cards(df.iloc[:visible]).reset_index(drop=True)
+
+    slots = np.array(column_order(nb_columns))[np.arange(len(cards)) % nb_columns]
+    column_html = cards.groupby(slots).agg("".join)
+    for col_index, col in enumerate(st.columns(nb_columns)):
+        if col_index in column_html.index:
+            col.markdown(column_html[col_index], unsafe_allow_html=True)
+
+    if visible < len(df):
+        st.caption(f"แสดง {visible} จาก {len(df)} ทวีต")
+        if st.button("Load more", key=f"{state_key}_more"):
+            st.session_state[state_key] = visible + page_size
+            st.rerun()
@@ -0,0 +1,82 @@
+import argparse
+import tempfile
+import time
+from pathlib import Path
+import pandas as pd
+
+# Import WordCloud classifier
+from src.backend.ml.wordcloud import WordCloud
+# Import classifier backends
+from src.backend.ml.backends import KeywordBackend
+# Import classification cache
+from src.backend.ml.classify_cache import ClassificationCache
+# Import tweet id backfill
+from src.backend.load.fingerprint import backfill_tweet_ids
+# Import modern logging configuration
+from config.logging.modern_log import LoggingConfig
+
+logger = LoggingConfig(level="INFO", level_console="INFO").get_logger()
+
+DATA = Path(__file__).resolve().parent.parent / "data" / "data.parquet"
+
+def load_tweets(path: Path, rows: int | None) -> pd.DataFrame:
+    df = pd.read_parquet(path)
+    # The sample snapshot predates postTimeRaw and stores the post time as `timestamp`
+    if "postTimeRaw" not in df.columns and "timestamp" in df.columns:
+        df = df.rename(columns={"timestamp": "postTimeRaw"})
+    df = backfill_tweet_ids(df).dropna(subset=["tweet_id"])
+    if rows:
+        df = df.head(rows)
+    # classify() keys its prompt index on a 0-based RangeIndex
+    return df.reset_index(drop=True)
+
+def bench_run(label: str, df: pd.DataFrame, cache: ClassificationCache, latency: float, concurrency: int, budget: int) -> dict:
+    # A fresh backend per run, so its counters only cover this run
+    backend = KeywordBackend(latency=latency)
+    word_cloud = WordCloud(backend=backend, concurrency=concurrency, cache=cache, batch_token_budget=budget)
+    hits, misses = cache.hits, cache.misses
+    start = time.perf_counter()
+    faqs_df = word_cloud.classify(df=df.copy())
+    elapsed = time.perf_counter() - start
+    hits, misses = cache.hits - hits, cache.misses - misses
+    return {
+        "run": label,
+        "rows": len(df),
+        "faqs": len(faqs_df),
+        "seconds": elapsed,
+        "rows_per_second": len(df) / elapsed if elapsed else 0.0,
+        "prompts": backend.calls,
+        "rows_per_prompt": backend.rows_sent / backend.calls if backend.calls else 0.0,
+        "tokens_per_prompt": backend.tokens_sent / backend.calls if backend.calls else 0.0,
+        "hit_rate": hits / (hits + misses) if hits + misses else 0.0,
+    }
+
+def main(data: Path, rows: int | None, latency: float, concurrency: int, budget: int):
+    df = load_tweets(data, rows)
+    logger.info(f"Loaded {len(df)} tweets from {data}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = ClassificationCache(path=str(Path(tmp) / "classify_cache.sqlite"))
+        # Cold run fills the empty cache; warm run replays the same tweets against it
+        results = [bench_run(label, df, cache, latency, concurrency, budget) for label in ("cold", "warm")]
+
+    for result in results:
+        logger.info(
+            f"{result['run']:>5}: {result['rows']} rows in {result['seconds']:.3f}s "
+            f"-> {result['rows_per_second']:.1f} rows/s, {result['faqs']} faq rows"
+        )
+        logger.info(
+            f"{'':>5}  {result['prompts']} prompts, {result['rows_per_prompt']:.1f} rows/prompt, "
+            f"{result['tokens_per_prompt']:.0f}/{budget} tokens/prompt "
+            f"({result['tokens_per_prompt'] / budget:.0%} of budget), cache hit rate {result['hit_rate']:.0%}"
+        )
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark WordCloud.classify offline with the keyword backend.")
+    parser.add_argument("--data", type=Path, default=DATA)
+    parser.add_argument("--rows", type=int, default=None)
+    parser.add_argument("--latency", type=float, default=0.5, help="Seconds per prompt, standing in for the Gemini round trip")
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--budget", type=int, default=3000)
+    args = parser.parse_args()
+    main(args.data, args.rows, args.latency, args.concurrency, args.budget)
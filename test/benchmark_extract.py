@@ -0,0 +1,78 @@
+import asyncio
+import argparse
+import time
+from pathlib import Path
+from playwright.async_api import async_playwright
+
+# Import XScraping for scraping
+from src.backend.scraping.x_scraping import XScraping
+# Import modern logging configuration
+from config.logging.modern_log import LoggingConfig
+
+logger = LoggingConfig(level="INFO", level_console="INFO").get_logger()
+
+FIXTURES = Path(__file__).resolve().parent / "fixtures"
+
+# Clone the fixture timeline until it holds `copies` times its articles, making every
+# tweet text unique so the (username, tweetText) dedup does not collapse the clones.
+REPEAT_TIMELINE_SCRIPT = """
+(copies) => {
+    const timeline = document.querySelector("[aria-label='Timeline: Search timeline']");
+    const cells = Array.from(timeline.querySelectorAll("[data-testid='cellInnerDiv']"));
+    for (let i = 1; i < copies; i++) {
+        for (const cell of cells) {
+            const clone = cell.cloneNode(true);
+            const text = clone.querySelector("[data-testid='tweetText'] span");
+            if (text) {
+                text.textContent += ` (${i})`;
+            }
+            timeline.appendChild(clone);
+        }
+    }
+    return document.querySelectorAll("article").length;
+}
+"""
+
+async def bench_mode(page, x_scraping: XScraping, mode: str, rounds: int) -> dict:
+    records = 0
+    start = time.perf_counter()
+    for _ in range(rounds):
+        seen_pairs, all_tweet_entries = set(), []
+        if mode == "script":
+            await x_scraping.extract_articles_in_page(page, "benchmark", "#benchmark", seen_pairs, all_tweet_entries)
+        else:
+            articles = await page.query_selector_all("article")
+            await x_scraping.extract_articles("benchmark", "#benchmark", 0, articles, seen_pairs, all_tweet_entries)
+        records += len(all_tweet_entries)
+    elapsed = time.perf_counter() - start
+    return {"mode": mode, "records": records, "seconds": elapsed, "records_per_second": records / elapsed if elapsed else 0.0}
+
+async def main(fixture: str, copies: int, rounds: int):
+    html = (FIXTURES / fixture).read_text(encoding="utf-8")
+    x_scraping = XScraping()
+    async with async_playwright() as p:
+        browser = await p.chromium.launch(headless=True)
+        page = await browser.new_page()
+        await page.set_content(html)
+        n_articles = await page.evaluate(REPEAT_TIMELINE_SCRIPT, copies)
+        logger.info(f"Loaded {fixture} with {n_articles} articles")
+
+        results = [await bench_mode(page, x_scraping, mode, rounds) for mode in ("dom", "script")]
+        await browser.close()
+
+    for result in results:
+        logger.info(
+            f"{result['mode']:>6}: {result['records']} records in {result['seconds']:.3f}s "
+            f"-> {result['records_per_second']:.1f} records/s"
+        )
+    dom, script = results
+    if dom["records_per_second"]:
+        logger.info(f"script / dom speedup: {script['records_per_second'] / dom['records_per_second']:.1f}x")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare DOM and in-page script extraction on saved X search HTML.")
+    parser.add_argument("--fixture", default="x_search_articles.html")
+    parser.add_argument("--copies", type=int, default=50)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+    asyncio.run(main(args.fixture, args.copies, args.rounds))
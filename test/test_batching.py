@@ -0,0 +1,46 @@
+from collections import Counter
+
+# Import token-budget batching
+from src.backend.ml.batching import MESSAGE_OVERHEAD_TOKENS, estimate_tokens, pack_batches, cap_vocabulary
+
+def rows(texts: list[str]) -> list[dict]:
+    return [{"tweetText": text} for text in texts]
+
+def batch_tokens(batch: list[dict]) -> int:
+    return sum(estimate_tokens(row["tweetText"]) + MESSAGE_OVERHEAD_TOKENS for row in batch)
+
+def test_thai_text_costs_more_tokens_per_character():
+    assert estimate_tokens("abcdefgh") == 2
+    assert estimate_tokens("สมัครหอใน") == 4
+    # Spaces are not counted
+    assert estimate_tokens("ab cd ef gh") == 2
+
+def test_batches_stay_within_the_token_budget():
+    texts = [f"สมัครหอในรอบ {i} " * (i % 7 + 1) for i in range(200)]
+    batches = pack_batches(rows(texts), budget_tokens=300, max_rows=60)
+    assert all(batch_tokens(batch) <= 300 for batch in batches)
+    # Order is preserved and nothing is dropped
+    assert [row["tweetText"] for batch in batches for row in batch] == texts
+
+def test_a_batch_closes_only_when_the_next_row_would_overflow():
+    batches = pack_batches(rows(["a" * 40] * 10), budget_tokens=42, max_rows=60)
+    # Each row costs 10 + 4 tokens, so three fit in 42
+    assert [len(batch) for batch in batches] == [3, 3, 3, 1]
+
+def test_batches_respect_max_rows():
+    batches = pack_batches(rows(["ok"] * 25), budget_tokens=10_000, max_rows=10)
+    assert [len(batch) for batch in batches] == [10, 10, 5]
+
+def test_an_oversized_row_gets_a_batch_of_its_own():
+    batches = pack_batches(rows(["a", "a" * 4000, "a"]), budget_tokens=100)
+    assert [len(batch) for batch in batches] == [1, 1, 1]
+    assert batches[1][0]["tweetText"] == "a" * 4000
+
+def test_no_rows_no_batches():
+    assert pack_batches([]) == []
+
+def test_vocabulary_keeps_the_most_used_topics():
+    vocabulary = Counter({"หอใน": 9, "ทุน": 5, "ค่าเทอม": 3, "รถตู้": 1})
+    assert cap_vocabulary(vocabulary, max_items=2) == ["หอใน", "ทุน"]
+    assert cap_vocabulary(vocabulary, max_tokens=3) == ["หอใน"]
+    assert cap_vocabulary(Counter()) == []
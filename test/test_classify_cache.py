@@ -0,0 +1,56 @@
+import pytest
+
+# Import classification cache
+from src.backend.ml import classify_cache
+from src.backend.ml.classify_cache import ClassificationCache, cache_key, results_by_index
+
+class Clock:
+    # Stands in for the time module so last_used strictly increases between calls
+    def __init__(self):
+        self.now = 1_000.0
+
+    def time(self) -> float:
+        self.now += 1
+        return self.now
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch) -> ClassificationCache:
+    monkeypatch.setattr(classify_cache, "time", Clock())
+    return ClassificationCache(path=str(tmp_path / "classify_cache.sqlite"), max_entries=2)
+
+def result(topic: str) -> dict:
+    return {"faq": [{"topic": [topic], "subtopic": [topic]}], "issue": []}
+
+def test_least_recently_used_entry_is_evicted(cache):
+    cache.put_many({"a": result("หอใน")})
+    cache.put_many({"b": result("ทุน")})
+    # Reading "a" makes "b" the least recently used entry
+    assert cache.get_many(["a"]) == {"a": result("หอใน")}
+    cache.put_many({"c": result("รถตู้")})
+    assert set(cache.get_many(["a", "b", "c"])) == {"a", "c"}
+
+def test_hits_and_misses_are_counted(cache):
+    cache.put_many({"a": result("หอใน")})
+    cache.get_many(["a", "a", "missing"])
+    assert (cache.hits, cache.misses) == (1, 1)
+
+def test_overwriting_an_entry_does_not_evict(cache):
+    cache.put_many({"a": result("หอใน"), "b": result("ทุน")})
+    cache.put_many({"a": result("ค่าเทอม")})
+    assert cache.get_many(["a", "b"]) == {"a": result("ค่าเทอม"), "b": result("ทุน")}
+
+def test_cache_key_normalizes_text_only():
+    assert cache_key("สมัคร  หอใน\n", "v1", "gemini") == cache_key("สมัคร หอใน", "v1", "gemini")
+    assert cache_key("TCAS", "v1", "gemini") == cache_key("tcas", "v1", "gemini")
+    assert cache_key("tcas", "v2", "gemini") != cache_key("tcas", "v1", "gemini")
+    assert cache_key("tcas", "v1", "keyword-v1") != cache_key("tcas", "v1", "gemini")
+
+def test_results_are_regrouped_by_message_index():
+    response = {
+        "faq": [{"index": "0", "topic": ["หอใน"], "subtopic": ["สมัคร"]}, {"topic": ["no index"]}],
+        "issue": [{"index": 2, "topic": ["รถตู้"], "subtopic": ["รอบเช้า"]}],
+    }
+    assert results_by_index(response) == {
+        0: {"faq": [{"topic": ["หอใน"], "subtopic": ["สมัคร"]}], "issue": []},
+        2: {"faq": [], "issue": [{"topic": ["รถตู้"], "subtopic": ["รอบเช้า"]}]},
+    }
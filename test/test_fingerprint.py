@@ -0,0 +1,57 @@
+import numpy as np
+import pandas as pd
+
+# Import dataset fingerprinting
+from src.backend.load.fingerprint import SHARD_COLUMNS, dataset_fingerprint, partition_fingerprints, changed_partitions, duplicated_keys, shard_keys, is_stored
+
+def tweets() -> pd.DataFrame:
+    return pd.DataFrame({
+        "tweet_id": [1925000000000000001, 1925000000000000002, 1925000000000000006, 1925000000000000007],
+        "tag": ["#มธ", "#นิติมธ", "#มธ", "#CISTU"],
+        "year": [2025, 2025, 2025, 2025],
+        "month": [5, 5, 5, 5],
+        "day": [21, 21, 22, 22],
+    })
+
+def test_fingerprint_ignores_row_order():
+    df = tweets()
+    shuffled = df.sample(frac=1, random_state=7).reset_index(drop=True)
+    assert dataset_fingerprint(shuffled) == dataset_fingerprint(df)
+    assert partition_fingerprints(shuffled) == partition_fingerprints(df)
+
+def test_fingerprint_changes_with_the_rows():
+    df = tweets()
+    changed = df.assign(tweet_id=df["tweet_id"].where(df.index != 0, 1925000000000000009))
+    assert dataset_fingerprint(changed) != dataset_fingerprint(df)
+    assert dataset_fingerprint(df.iloc[:3]) != dataset_fingerprint(df)
+
+def test_only_the_touched_partition_changes():
+    df = tweets()
+    previous = partition_fingerprints(df)
+    current = partition_fingerprints(pd.concat([df, df.iloc[[3]].assign(tweet_id=1925000000000000008)]))
+    assert changed_partitions(previous, current) == ["2025-05-22"]
+    assert changed_partitions(previous, partition_fingerprints(df.iloc[:2])) == ["2025-05-22"]
+    assert partition_fingerprints(df.iloc[0:0]) == {}
+
+def test_duplicated_keys_compare_list_cells():
+    df = pd.DataFrame({
+        "tweet_id": [1, 1, 1],
+        "subtopic": [["หอใน", "สมัคร"], ["หอใน", "สมัคร"], np.array(["ทุน"])],
+    })
+    assert duplicated_keys(df, ["tweet_id", "subtopic"]).tolist() == [False, True, False]
+
+def test_a_stored_tweet_is_new_under_another_tag():
+    known = shard_keys(tweets())
+    batch = pd.DataFrame({
+        "tweet_id": pd.array([1925000000000000001, 1925000000000000001, 1925000000000000003], dtype="Int64"),
+        "tag": pd.Categorical(["#มธ", "#TCAS", "#มธ"]),
+    })
+    assert is_stored(batch, known).tolist() == [True, False, False]
+    assert is_stored(batch, shard_keys(pd.DataFrame(columns=SHARD_COLUMNS))).tolist() == [False, False, False]
+
+def test_shard_keys_are_unique_and_sorted():
+    df = tweets()
+    keys = shard_keys(pd.concat([df, df.iloc[::-1]]))
+    assert len(keys) == len(df)
+    assert keys["tweet_id"].is_monotonic_increasing
+    assert keys.dtypes["tweet_id"] == "int64"
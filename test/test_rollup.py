@@ -0,0 +1,72 @@
+from datetime import datetime
+import pandas as pd
+
+# Import time-bucket rollups
+from src.backend.load.rollup import ROLLUP_KEYS, SUBTOPIC_KEYS, rollup_counts, subtopic_counts, subtopic_index, merge_counts, dataset_summary, merge_summaries
+
+def tweets() -> pd.DataFrame:
+    return pd.DataFrame({
+        "postTimeRaw": [datetime(2025, 5, 21, 3, 1), datetime(2025, 5, 21, 3, 14), datetime(2025, 5, 21, 3, 15), datetime(2025, 5, 21, 23, 59)],
+        "category": ["ธรรมศาสตร์"] * 4,
+        "tag": ["#มธ", "#มธ", "#มธ", "#TCAS"],
+    })
+
+def classified() -> pd.DataFrame:
+    return pd.DataFrame({
+        "postTimeRaw": [datetime(2025, 5, 21, 3, 1), datetime(2025, 5, 21, 3, 5), datetime(2025, 5, 21, 3, 5)],
+        "tag": ["#มธ", "#มธ", "#TCAS"],
+        "subtopic": [["หอใน", "มธ"], ["หอใน", "หอใน"], ["หอใน"]],
+        "tweet_id": [1, 2, 2],
+        "year": [2025] * 3,
+        "month": [5] * 3,
+        "day": [21] * 3,
+    })
+
+def test_rollup_counts_per_fifteen_minute_bucket():
+    counts = rollup_counts(tweets()).set_index(ROLLUP_KEYS)["count"]
+    assert counts[(pd.Timestamp("2025-05-21 03:00"), "ธรรมศาสตร์", "#มธ")] == 2
+    assert counts[(pd.Timestamp("2025-05-21 03:15"), "ธรรมศาสตร์", "#มธ")] == 1
+    assert counts[(pd.Timestamp("2025-05-21 23:45"), "ธรรมศาสตร์", "#TCAS")] == 1
+    assert counts.sum() == 4
+
+def test_buckets_carry_their_day_partition():
+    counts = rollup_counts(tweets())
+    assert counts[["year", "month", "day"]].drop_duplicates().values.tolist() == [[2025, 5, 21]]
+
+def test_empty_input_gives_empty_counts():
+    assert rollup_counts(tweets().iloc[0:0]).empty
+    assert subtopic_counts(classified().iloc[0:0]).empty
+
+def test_subtopic_counts_skip_hashtag_words():
+    counts = subtopic_counts(classified()).set_index(SUBTOPIC_KEYS)["count"]
+    assert "มธ" not in counts.index.get_level_values("subtopic")
+    assert counts[(pd.Timestamp("2025-05-21 03:00"), "#มธ", "หอใน")] == 3
+    assert counts[(pd.Timestamp("2025-05-21 03:00"), "#TCAS", "หอใน")] == 1
+
+def test_subtopic_index_has_one_entry_per_tweet_and_tag():
+    index = subtopic_index(classified())
+    assert sorted(index[["subtopic", "tweet_id", "tag"]].itertuples(index=False, name=None)) == [
+        ("หอใน", 1, "#มธ"),
+        ("หอใน", 2, "#TCAS"),
+        ("หอใน", 2, "#มธ"),
+    ]
+    assert subtopic_index(classified().drop(columns=["tweet_id"])).empty
+
+def test_merge_counts_sums_matching_keys():
+    first = rollup_counts(tweets().iloc[:2])
+    second = rollup_counts(tweets().iloc[1:])
+    merged = merge_counts(ROLLUP_KEYS, first, second, first.iloc[0:0]).set_index(ROLLUP_KEYS)["count"]
+    assert merged[(pd.Timestamp("2025-05-21 03:00"), "ธรรมศาสตร์", "#มธ")] == 3
+    assert merged.sum() == 5
+
+def test_summaries_merge_to_the_overall_bounds():
+    df = tweets()
+    first, second = dataset_summary(df.iloc[:2]), dataset_summary(df.iloc[2:])
+    assert merge_summaries(first, second) == dataset_summary(df) == {
+        "tags": ["#TCAS", "#มธ"],
+        "min_post_time": "2025-05-21T03:01:00",
+        "max_post_time": "2025-05-21T23:59:00",
+    }
+    empty = dataset_summary(df.iloc[0:0])
+    assert merge_summaries(empty, first) == first
+    assert merge_summaries(empty) == empty
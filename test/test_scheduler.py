@@ -0,0 +1,47 @@
+import asyncio
+import math
+import pytest
+
+# Import tag scheduler
+from src.backend.pipeline.scheduler import TagScheduler
+# Import scrape state store
+from src.backend.scraping.state_store import ScrapeStateStore
+
+NOW = 1_750_000_000.0
+HOUR = 3600.0
+
+@pytest.fixture
+def scheduler(tmp_path) -> TagScheduler:
+    return TagScheduler(concurrency=2, state_store=ScrapeStateStore(path=str(tmp_path / "scrape_state.sqlite")))
+
+def test_never_scraped_tags_come_first(scheduler):
+    assert scheduler.priority(None, NOW) == math.inf
+    assert scheduler.priority({"last_scraped": None, "avg_yield": None}, NOW) == math.inf
+
+def test_priority_grows_with_yield_and_staleness(scheduler):
+    assert scheduler.priority({"last_scraped": NOW - 2 * HOUR, "avg_yield": 4.0}, NOW) == pytest.approx(10.0)
+    busy = scheduler.priority({"last_scraped": NOW - HOUR, "avg_yield": 20.0}, NOW)
+    quiet = scheduler.priority({"last_scraped": NOW - HOUR, "avg_yield": 0.0}, NOW)
+    stale = scheduler.priority({"last_scraped": NOW - 48 * HOUR, "avg_yield": 0.0}, NOW)
+    assert busy > quiet
+    assert stale > busy
+    # Clock skew never makes a priority negative
+    assert scheduler.priority({"last_scraped": NOW + HOUR, "avg_yield": 3.0}, NOW) == 0
+
+def test_order_follows_priority(scheduler):
+    scheduler.state_store.record_scrape("#quiet", 0)
+    scheduler.state_store.record_scrape("#busy", 50)
+    jobs = [("ธรรมศาสตร์", "#quiet", "q"), ("ธรรมศาสตร์", "#busy", "b"), ("ธรรมศาสตร์", "#new", "n")]
+    assert [tag for _, tag, _ in scheduler.order(jobs)] == ["#new", "#busy", "#quiet"]
+
+def test_run_skips_failed_tags_and_records_yield(scheduler):
+    async def worker(category: str, tag: str, url: str) -> list[dict]:
+        if tag == "#broken":
+            raise RuntimeError("X blocked the page")
+        return [{"tag": tag}] * len(url)
+
+    jobs = [("ธรรมศาสตร์", "#a", "x"), ("ธรรมศาสตร์", "#broken", "y"), ("ธรรมศาสตร์", "#b", "zz")]
+    results = asyncio.run(scheduler.run(jobs, worker))
+    assert sorted(len(result) for result in results) == [1, 2]
+    assert scheduler.state_store.tag_state("#b")["last_yield"] == 2
+    assert scheduler.state_store.tag_state("#broken") is None
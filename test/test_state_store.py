@@ -0,0 +1,58 @@
+from datetime import datetime
+import pandas as pd
+import pytest
+
+# Import scrape state store
+from src.backend.scraping.state_store import ScrapeStateStore
+
+@pytest.fixture
+def store(tmp_path) -> ScrapeStateStore:
+    return ScrapeStateStore(path=str(tmp_path / "scrape_state.sqlite"), max_recent_keys=3)
+
+def tweets(tag: str, rows: list[tuple[int, datetime]]) -> pd.DataFrame:
+    return pd.DataFrame({
+        "tag": pd.Categorical([tag] * len(rows)),
+        "tweet_id": pd.array([tweet_id for tweet_id, _ in rows], dtype="Int64"),
+        "tweet_link": [f"https://x.com/tu/status/{tweet_id}" for tweet_id, _ in rows],
+        "postTimeRaw": [post_time for _, post_time in rows],
+    })
+
+def test_high_water_mark_is_the_newest_post_per_tag(store):
+    store.record_tweets(pd.concat([
+        tweets("#มธ", [(11, datetime(2025, 5, 21, 3, 0)), (12, datetime(2025, 5, 21, 4, 0))]),
+        tweets("#TCAS", [(21, datetime(2025, 5, 20, 9, 0))]),
+    ]))
+    assert store.high_water_marks() == {"#มธ": datetime(2025, 5, 21, 4, 0), "#TCAS": datetime(2025, 5, 20, 9, 0)}
+    assert store.tag_state("#มธ")["last_tweet_id"] == "12"
+
+def test_high_water_mark_never_moves_back(store):
+    store.record_tweets(tweets("#มธ", [(12, datetime(2025, 5, 21, 4, 0))]))
+    store.record_tweets(tweets("#มธ", [(10, datetime(2025, 5, 20, 1, 0))]))
+    assert store.high_water_marks() == {"#มธ": datetime(2025, 5, 21, 4, 0)}
+    store.record_tweets(tweets("#มธ", [(13, datetime(2025, 5, 21, 5, 0))]))
+    assert store.high_water_marks() == {"#มธ": datetime(2025, 5, 21, 5, 0)}
+
+def test_recent_keys_are_status_ids_per_tag(store):
+    store.record_tweets(tweets("#มธ", [(11, datetime(2025, 5, 21, 3, 0))]))
+    # Rows without a tweet_id column fall back to the link
+    store.record_tweets(tweets("#TCAS", [(21, datetime(2025, 5, 21, 3, 0))]).drop(columns=["tweet_id"]))
+    assert store.recent_keys("#มธ") == {"11"}
+    assert store.recent_keys("#TCAS") == {"21"}
+    assert store.recent_keys("#นิติมธ") == set()
+
+def test_recent_keys_are_capped(store):
+    store.record_tweets(tweets("#มธ", [(11, datetime(2025, 5, 21, 3, 0)), (12, datetime(2025, 5, 21, 3, 5))]))
+    store.record_tweets(tweets("#มธ", [(13, datetime(2025, 5, 21, 3, 10)), (14, datetime(2025, 5, 21, 3, 15))]))
+    keys = store.recent_keys("#มธ")
+    assert len(keys) == 3
+    assert {"13", "14"} <= keys
+
+def test_yield_is_smoothed(store):
+    assert store.tag_state("#มธ") is None
+    store.record_scrape("#มธ", 10)
+    store.record_scrape("#มธ", 2)
+    state = store.tag_state("#มธ")
+    assert state["last_yield"] == 2
+    assert state["avg_yield"] == pytest.approx(6.0)
+    # A scrape alone sets no high-water mark
+    assert store.high_water_marks() == {}
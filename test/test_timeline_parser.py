@@ -0,0 +1,57 @@
+import json
+from datetime import datetime
+from pathlib import Path
+
+# Import SearchTimeline response parser
+from src.backend.scraping.timeline_parser import is_search_timeline_response, iter_tweet_results, parse_search_timeline
+
+FIXTURES = Path(__file__).resolve().parent / "fixtures"
+
+def load_payload(fixture: str = "search_timeline.json") -> dict:
+    return json.loads((FIXTURES / fixture).read_text(encoding="utf-8"))
+
+def test_search_timeline_url():
+    assert is_search_timeline_response("https://x.com/i/api/graphql/AbC123/SearchTimeline?variables=%7B%7D")
+    assert not is_search_timeline_response("https://x.com/i/api/graphql/AbC123/UserByScreenName?variables=%7B%7D")
+
+def test_entries_are_parsed():
+    tweets = parse_search_timeline(load_payload(), "ธรรมศาสตร์", "#ธรรมศาสตร์ช้างเผือก")
+    assert sorted(tweets) == [
+        "1925000000000000001",
+        "1925000000000000002",
+        "1925000000000000006",
+        "1925000000000000007",
+    ]
+    tweet = tweets["1925000000000000001"]
+    assert tweet["category"] == "ธรรมศาสตร์"
+    assert tweet["tag"] == "#ธรรมศาสตร์ช้างเผือก"
+    assert tweet["username"] == "@dek70_tu"
+    assert tweet["postTimeRaw"] == datetime(2025, 5, 21, 3, 15, 42)
+    assert tweet["tweet_link"] == "https://x.com/dek70_tu/status/1925000000000000001"
+    # The media t.co link is not part of the text the DOM shows
+    assert tweet["tweetText"] == "สมัครหอในรอบสองเปิดวันไหนคะ #ธรรมศาสตร์ช้างเผือก"
+
+def test_visibility_wrapper_and_legacy_user():
+    tweet = parse_search_timeline(load_payload(), "คณะนิติศาสตร์", "#นิติมธ")["1925000000000000002"]
+    assert tweet["username"] == "@lawtu_student"
+    assert tweet["tweetText"] == "ค่าเทอม & ทุน กยศ. ต้องยื่นเอกสารที่ไหน >< #นิติมธ"
+
+def test_note_tweet_text_wins_over_truncated_text():
+    tweet = parse_search_timeline(load_payload(), "ธรรมศาสตร์", "#มธ")["1925000000000000006"]
+    assert tweet["tweetText"].endswith("ผ่านระบบ reg.tu.ac.th")
+
+def test_module_items_are_parsed():
+    tweet = parse_search_timeline(load_payload(), "วิทยาลัยสหวิทยาการ", "#CISTU")["1925000000000000007"]
+    assert tweet["username"] == "@cistu_club"
+
+def test_promoted_tombstoned_and_cursor_entries_are_skipped():
+    ids = [result.get("rest_id") for result in iter_tweet_results(load_payload())]
+    # Promoted by entry id (3), promoted by metadata (4), tombstone (5); cursors never yield a result
+    assert "1925000000000000003" not in ids
+    assert "1925000000000000004" not in ids
+    assert None not in ids
+    assert len(ids) == 4
+
+def test_unexpected_payloads_yield_nothing():
+    assert parse_search_timeline({}, "ธรรมศาสตร์", "#มธ") == {}
+    assert parse_search_timeline({"errors": [{"message": "Rate limit exceeded"}]}, "ธรรมศาสตร์", "#มธ") == {}
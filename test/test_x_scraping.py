@@ -0,0 +1,72 @@
+import json
+from datetime import datetime
+from pathlib import Path
+
+# Import X scraper
+from src.backend.scraping.x_scraping import XScraping
+
+FIXTURES = Path(__file__).resolve().parent / "fixtures"
+CATEGORY = "ธรรมศาสตร์"
+TAG = "#ธรรมศาสตร์ช้างเผือก"
+
+def load_payload(fixture: str = "search_timeline.json") -> dict:
+    return json.loads((FIXTURES / fixture).read_text(encoding="utf-8"))
+
+def scroll(seen_pairs: set, since: datetime, all_tweet_entries: list | None = None) -> tuple[bool, list]:
+    # One network-mode scroll: extract the captured response, then check the high-water mark
+    x_scraping = XScraping(extract_mode="network")
+    all_tweet_entries = [] if all_tweet_entries is None else all_tweet_entries
+    n_before = len(all_tweet_entries)
+    read_tweets = x_scraping.extract_timeline(CATEGORY, TAG, [load_payload()], seen_pairs, all_tweet_entries)
+    return x_scraping.trim_to_high_water(all_tweet_entries, n_before, since, read_tweets), all_tweet_entries
+
+def test_stops_when_every_tweet_is_already_stored():
+    # A quiet period: the newest tweets on the page are the ones earlier runs stored
+    stored = {"1925000000000000001", "1925000000000000002", "1925000000000000006", "1925000000000000007"}
+    stop, entries = scroll(stored, since=datetime(2025, 5, 21, 6, 45, 10))
+    assert stop
+    assert entries == []
+
+def test_stops_when_every_tweet_is_at_or_before_the_mark():
+    stop, entries = scroll(set(), since=datetime(2025, 5, 21, 6, 45, 10))
+    assert stop
+    assert entries == []
+
+def test_continues_while_a_scroll_brings_fresh_tweets():
+    stop, entries = scroll(set(), since=datetime(2025, 5, 21, 5, 0))
+    assert not stop
+    assert [entry["tweet_link"] for entry in entries] == [
+        "https://x.com/tu_reg/status/1925000000000000006",
+        "https://x.com/cistu_club/status/1925000000000000007",
+    ]
+
+def test_seen_and_old_tweets_together_stop_the_scroll():
+    # The newer tweets were stored already, the rest are older than the mark
+    stop, entries = scroll({"1925000000000000006", "1925000000000000007"}, since=datetime(2025, 5, 21, 5, 0))
+    assert stop
+    assert entries == []
+
+def test_earlier_scrolls_are_kept():
+    earlier = [{"postTimeRaw": datetime(2025, 5, 21, 7, 0), "tweet_link": "https://x.com/tu_news/status/1925000000000000009"}]
+    stop, entries = scroll(set(), since=datetime(2025, 5, 21, 6, 45, 10), all_tweet_entries=list(earlier))
+    assert stop
+    assert entries == earlier
+
+def test_empty_scroll_does_not_stop():
+    # The SearchTimeline response may not have been parsed yet
+    x_scraping = XScraping(extract_mode="network")
+    all_tweet_entries = []
+    read_tweets = x_scraping.extract_timeline(CATEGORY, TAG, [], set(), all_tweet_entries)
+    assert read_tweets == 0
+    assert not x_scraping.trim_to_high_water(all_tweet_entries, 0, datetime(2025, 5, 21), read_tweets)
+
+def test_add_tweet_entry_skips_stored_status_ids():
+    x_scraping = XScraping()
+    seen_pairs = {"1925000000000000001"}
+    all_tweet_entries = []
+    added = x_scraping.add_tweet_entry(
+        CATEGORY, TAG, "@dek70_tu", "สมัครหอในรอบสองเปิดวันไหนคะ", "2025-05-21T03:15:42.000Z",
+        "/dek70_tu/status/1925000000000000001", seen_pairs, all_tweet_entries,
+    )
+    assert not added
+    assert all_tweet_entries == []